@@ -0,0 +1,39 @@
+"""task overdue scanner
+
+Revision ID: 26acb53aa831
+Revises: 9f066b883c09
+Create Date: 2026-10-18 17:40:12.118590
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '26acb53aa831'
+down_revision: Union[str, None] = '9f066b883c09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task', sa.Column('overdue_notified_at', sa.DateTime(), nullable=True))
+    # Tasks already past due when this ships are not announced all at once
+    op.execute(
+        "UPDATE task SET overdue_notified_at = now() AT TIME ZONE 'UTC' "
+        "WHERE due_date <= now() AT TIME ZONE 'UTC' AND status NOT IN ('COMPLETED', 'CANCELLED')"
+    )
+    op.create_index(
+        'ix_task_overdue_due_date', 'task', ['due_date'], unique=False,
+        postgresql_where=sa.text(
+            "due_date IS NOT NULL AND overdue_notified_at IS NULL "
+            "AND status NOT IN ('COMPLETED', 'CANCELLED')"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_overdue_due_date', table_name='task')
+    op.drop_column('task', 'overdue_notified_at')
@@ -0,0 +1,51 @@
+"""unaccent search indexes
+
+Revision ID: 2a1f5c1d0e7b
+Revises: b9236a269d15
+Create Date: 2026-10-18 11:20:06.118452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a1f5c1d0e7b'
+down_revision: Union[str, None] = 'b9236a269d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UNACCENT_COLUMNS = [
+    ('task', 'title'),
+    ('task', 'description'),
+    ('categories', 'title'),
+    ('categories', 'description'),
+    ('notes', 'title'),
+    ('notes', 'description'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    # unaccent() is only STABLE because its dictionary can change, pin the
+    # dictionary in an IMMUTABLE wrapper so it can be used in an index
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+    for table, column in UNACCENT_COLUMNS:
+        op.execute(
+            f'CREATE INDEX ix_{table}_{column}_unaccent_trgm ON {table} '
+            f'USING gin (f_unaccent(lower({column})) gin_trgm_ops)'
+        )
+
+
+def downgrade() -> None:
+    for table, column in reversed(UNACCENT_COLUMNS):
+        op.drop_index(f'ix_{table}_{column}_unaccent_trgm', table_name=table)
+    op.execute('DROP FUNCTION IF EXISTS f_unaccent(text)')
@@ -0,0 +1,76 @@
+"""task archive
+
+Revision ID: 3c8e1f5a9d20
+Revises: b47b59088f2d
+Create Date: 2026-10-18 20:12:54.601839
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e1f5a9d20'
+down_revision: Union[str, None] = 'b47b59088f2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_task_closed_updated_at', 'task', ['updated_at'], unique=False,
+        postgresql_where=sa.text("status IN ('COMPLETED', 'CANCELLED')"),
+    )
+    # No counter, tombstone or event triggers here: the move out of task
+    # already fired them as a delete
+    op.create_table('task_archive',
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('status', postgresql.ENUM(name='etaskstatus', create_type=False), nullable=False),
+    sa.Column('priority', postgresql.ENUM(name='etaskpriority', create_type=False), nullable=False),
+    sa.Column('due_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('categories_id', sa.Uuid(), nullable=True),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ),
+    sa.ForeignKeyConstraint(['categories_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_archive_owner_id_created_at_id', 'task_archive', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_table('notes_archive',
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('task_id', sa.Uuid(), nullable=False),
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['task_archive.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notes_archive_task_id', 'notes_archive', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notes_archive_task_id', table_name='notes_archive')
+    op.drop_table('notes_archive')
+    op.drop_index('ix_task_archive_owner_id_created_at_id', table_name='task_archive')
+    op.drop_table('task_archive')
+    op.drop_index('ix_task_closed_updated_at', table_name='task')
@@ -0,0 +1,38 @@
+"""task fulltext search vector
+
+Revision ID: 4bdc3461dc96
+Revises: f7e206105806
+Create Date: 2026-10-18 10:03:17.224905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4bdc3461dc96'
+down_revision: Union[str, None] = 'f7e206105806'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_task_search_vector', 'task', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_search_vector', table_name='task', postgresql_using='gin')
+    op.drop_column('task', 'search_vector')
@@ -0,0 +1,34 @@
+"""task reminders
+
+Revision ID: 4d593ea2ae4f
+Revises: 6fad4a65abae
+Create Date: 2026-10-18 19:02:38.965104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d593ea2ae4f'
+down_revision: Union[str, None] = '6fad4a65abae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task', sa.Column('reminder_sent_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_task_reminder_due_date', 'task', ['due_date'], unique=False,
+        postgresql_where=sa.text(
+            "due_date IS NOT NULL AND reminder_sent_at IS NULL "
+            "AND status NOT IN ('COMPLETED', 'CANCELLED')"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_reminder_due_date', table_name='task')
+    op.drop_column('task', 'reminder_sent_at')
@@ -0,0 +1,31 @@
+"""task sort indexes
+
+Revision ID: 5e0b7a3f9c12
+Revises: a61d2e7c0b94
+Create Date: 2026-10-18 21:15:42.587301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b7a3f9c12'
+down_revision: Union[str, None] = 'a61d2e7c0b94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Covers the due date range filter of the old index as well
+    op.drop_index('ix_task_owner_id_due_date', table_name='task')
+    op.create_index('ix_task_owner_id_due_date_id', 'task', ['owner_id', 'due_date', 'id'], unique=False)
+    op.create_index('ix_task_owner_id_priority_id', 'task', ['owner_id', 'priority', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_owner_id_priority_id', table_name='task')
+    op.drop_index('ix_task_owner_id_due_date_id', table_name='task')
+    op.create_index('ix_task_owner_id_due_date', 'task', ['owner_id', 'due_date'], unique=False)
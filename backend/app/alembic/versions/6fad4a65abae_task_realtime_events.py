@@ -0,0 +1,78 @@
+"""task realtime events
+
+Revision ID: 6fad4a65abae
+Revises: 26acb53aa831
+Create Date: 2026-10-18 18:26:50.377104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6fad4a65abae'
+down_revision: Union[str, None] = '26acb53aa831'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with app.core.realtime
+CHANNEL = 'task_events'
+MAX_EVENT_IDS = 100
+
+# Columns a client sees, updates touching none of them (e.g. the overdue
+# scanner's bookkeeping) are not announced
+VISIBLE_COLUMNS = ('title', 'description', 'status', 'priority', 'due_date', 'categories_id')
+
+
+def _notify(event_type: str, source: str) -> str:
+    """
+    One NOTIFY per owner and statement, with the ids of the tasks of source
+    """
+    return f"""
+        PERFORM pg_notify('{CHANNEL}', event::text) FROM (
+            SELECT json_build_object(
+                'type', '{event_type}',
+                'owner_id', owner_id,
+                'count', count(*),
+                'ids', CASE WHEN count(*) <= {MAX_EVENT_IDS} THEN json_agg(id) END
+            ) AS event
+            FROM ({source}) AS changes
+            GROUP BY owner_id
+        ) AS events;
+    """
+
+
+def upgrade() -> None:
+    changed = ' OR '.join(f'n.{column} IS DISTINCT FROM o.{column}' for column in VISIBLE_COLUMNS)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION task_publish_events() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_notify('task.created', 'SELECT id, owner_id FROM new_rows')}
+            ELSIF TG_OP = 'UPDATE' THEN
+                {_notify('task.updated', f'SELECT n.id, n.owner_id FROM new_rows AS n JOIN old_rows AS o ON o.id = n.id WHERE {changed}')}
+            ELSE
+                {_notify('task.deleted', 'SELECT id, owner_id FROM old_rows')}
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    for event, referencing in (
+        ('INSERT', 'REFERENCING NEW TABLE AS new_rows'),
+        ('UPDATE', 'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+        ('DELETE', 'REFERENCING OLD TABLE AS old_rows'),
+    ):
+        op.execute(
+            f'CREATE TRIGGER task_events_{event.lower()} AFTER {event} ON task '
+            f'{referencing} FOR EACH STATEMENT EXECUTE FUNCTION task_publish_events()'
+        )
+
+
+def downgrade() -> None:
+    for event in ('insert', 'update', 'delete'):
+        op.execute(f'DROP TRIGGER IF EXISTS task_events_{event} ON task')
+    op.execute('DROP FUNCTION IF EXISTS task_publish_events()')
@@ -0,0 +1,86 @@
+"""task delta sync
+
+Revision ID: 882faf6f1ac5
+Revises: dec1341baa29
+Create Date: 2026-10-18 16:20:37.804113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '882faf6f1ac5'
+down_revision: Union[str, None] = 'dec1341baa29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with app.api.sync.TOMBSTONE_RETENTION
+TOMBSTONE_RETENTION = '30 days'
+
+# Columns a client edits, writing any of them counts as a change to sync
+SYNCED_COLUMNS = ('title', 'description', 'status', 'priority', 'due_date', 'categories_id')
+
+
+def upgrade() -> None:
+    op.create_index('ix_task_owner_id_updated_at_id', 'task', ['owner_id', 'updated_at', 'id'], unique=False)
+    op.create_table('task_tombstone',
+    sa.Column('task_id', sa.Uuid(), nullable=False),
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_task_tombstone_owner_id_deleted_at', 'task_tombstone', ['owner_id', 'deleted_at'], unique=False)
+
+    # updated_at is the sync watermark, so it has to come from the database
+    # clock rather than from whatever the client or an import file sent.
+    # Like every timestamp column it holds naive UTC, whatever the TimeZone.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION task_touch_updated_at() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.updated_at := now() AT TIME ZONE 'UTC';
+            RETURN NEW;
+        END
+        $$
+    """)
+    op.execute(
+        f"CREATE TRIGGER task_touch_updated_at BEFORE INSERT OR UPDATE OF {', '.join(SYNCED_COLUMNS)} "
+        "ON task FOR EACH ROW EXECUTE FUNCTION task_touch_updated_at()"
+    )
+
+    # Tasks removed together with their owner need no tombstone, the owner
+    # row is already gone when the cascaded delete fires this trigger
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION task_record_tombstones() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO task_tombstone (task_id, owner_id, deleted_at)
+            SELECT o.id, o.owner_id, now() AT TIME ZONE 'UTC' FROM old_rows AS o
+            WHERE EXISTS (SELECT 1 FROM "user" AS u WHERE u.id = o.owner_id)
+            ON CONFLICT (task_id) DO NOTHING;
+
+            DELETE FROM task_tombstone AS t
+            WHERE t.owner_id IN (SELECT DISTINCT owner_id FROM old_rows)
+              AND t.deleted_at < now() AT TIME ZONE 'UTC' - interval '{TOMBSTONE_RETENTION}';
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute(
+        'CREATE TRIGGER task_tombstones AFTER DELETE ON task '
+        'REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION task_record_tombstones()'
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS task_tombstones ON task')
+    op.execute('DROP FUNCTION IF EXISTS task_record_tombstones()')
+    op.execute('DROP TRIGGER IF EXISTS task_touch_updated_at ON task')
+    op.execute('DROP FUNCTION IF EXISTS task_touch_updated_at()')
+    op.drop_index('ix_task_tombstone_owner_id_deleted_at', table_name='task_tombstone')
+    op.drop_table('task_tombstone')
+    op.drop_index('ix_task_owner_id_updated_at_id', table_name='task')
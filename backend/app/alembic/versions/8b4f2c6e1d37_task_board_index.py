@@ -0,0 +1,28 @@
+"""task board index
+
+Revision ID: 8b4f2c6e1d37
+Revises: 5e0b7a3f9c12
+Create Date: 2026-10-18 21:48:09.730164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4f2c6e1d37'
+down_revision: Union[str, None] = '5e0b7a3f9c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_task_owner_id_status_created_at_id', 'task', ['owner_id', 'status', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_owner_id_status_created_at_id', table_name='task')
@@ -0,0 +1,26 @@
+"""notes task_id index
+
+Revision ID: 9f066b883c09
+Revises: 882faf6f1ac5
+Create Date: 2026-10-18 17:05:21.640917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f066b883c09'
+down_revision: Union[str, None] = '882faf6f1ac5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_notes_task_id', 'notes', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notes_task_id', table_name='notes')
@@ -0,0 +1,28 @@
+"""task search filter indexes
+
+Revision ID: a61d2e7c0b94
+Revises: 3c8e1f5a9d20
+Create Date: 2026-10-18 20:47:21.093516
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61d2e7c0b94'
+down_revision: Union[str, None] = '3c8e1f5a9d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_task_owner_id_status_priority', 'task', ['owner_id', 'status', 'priority'], unique=False)
+    op.create_index('ix_task_owner_id_due_date', 'task', ['owner_id', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_owner_id_due_date', table_name='task')
+    op.drop_index('ix_task_owner_id_status_priority', table_name='task')
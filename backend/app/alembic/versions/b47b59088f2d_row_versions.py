@@ -0,0 +1,31 @@
+"""row versions
+
+Revision ID: b47b59088f2d
+Revises: 4d593ea2ae4f
+Create Date: 2026-10-18 19:41:07.318422
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b47b59088f2d'
+down_revision: Union[str, None] = '4d593ea2ae4f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('task', 'notes', 'categories')
+
+
+def upgrade() -> None:
+    # A constant default, existing rows get it without a table rewrite
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, 'version')
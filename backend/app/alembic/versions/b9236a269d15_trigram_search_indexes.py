@@ -0,0 +1,45 @@
+"""trigram search indexes
+
+Revision ID: b9236a269d15
+Revises: 4bdc3461dc96
+Create Date: 2026-10-18 10:41:52.870311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9236a269d15'
+down_revision: Union[str, None] = '4bdc3461dc96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = [
+    ('task', 'title'),
+    ('task', 'description'),
+    ('categories', 'title'),
+    ('categories', 'description'),
+    ('notes', 'title'),
+    ('notes', 'description'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f'ix_{table}_{column}_trgm',
+            table,
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    for table, column in reversed(TRIGRAM_COLUMNS):
+        op.drop_index(f'ix_{table}_{column}_trgm', table_name=table)
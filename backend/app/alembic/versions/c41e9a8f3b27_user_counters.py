@@ -0,0 +1,158 @@
+"""user counters
+
+Revision ID: c41e9a8f3b27
+Revises: 2a1f5c1d0e7b
+Create Date: 2026-10-18 12:02:44.391027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e9a8f3b27'
+down_revision: Union[str, None] = '2a1f5c1d0e7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASK_COUNTER_COLUMNS = {
+    'task_total': 'true',
+    'task_pending': "status = 'PENDING'",
+    'task_in_progress': "status = 'IN_PROGRESS'",
+    'task_completed': "status = 'COMPLETED'",
+    'task_cancelled': "status = 'CANCELLED'",
+    'task_high': "priority = 'HIGH'",
+    'task_medium': "priority = 'MEDIUM'",
+    'task_low': "priority = 'LOW'",
+}
+
+
+def _task_deltas(source: str) -> str:
+    """
+    SELECT owner_id and one signed delta per counter column from source,
+    a relation with owner_id, status, priority and sign
+    """
+    sums = ', '.join(
+        f'sum(CASE WHEN {condition} THEN sign ELSE 0 END) AS {column}'
+        for column, condition in TASK_COUNTER_COLUMNS.items()
+    )
+    return f'SELECT owner_id, {sums} FROM ({source}) AS changes GROUP BY owner_id'
+
+
+def _counter_function(name: str, columns: list[str], deltas: dict[str, str]) -> str:
+    """
+    Statement-level trigger function applying the aggregated deltas of the
+    transition tables to user_counters.
+    Inserts upsert the owner's row, updates and deletes only touch an
+    existing row so cascaded deletes of a removed user are a no-op.
+    """
+    upsert_set = ', '.join(f'{column} = c.{column} + EXCLUDED.{column}' for column in columns)
+    update_set = ', '.join(f'{column} = c.{column} + d.{column}' for column in columns)
+    column_list = ', '.join(columns)
+    return f"""
+        CREATE OR REPLACE FUNCTION {name}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO user_counters AS c (owner_id, {column_list})
+                {deltas['INSERT']}
+                ON CONFLICT (owner_id) DO UPDATE SET {upsert_set};
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE user_counters AS c SET {update_set}
+                FROM ({deltas['UPDATE']}) AS d
+                WHERE c.owner_id = d.owner_id;
+            ELSE
+                UPDATE user_counters AS c SET {update_set}
+                FROM ({deltas['DELETE']}) AS d
+                WHERE c.owner_id = d.owner_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """
+
+
+def _create_triggers(table: str, function: str, events: list[str]) -> None:
+    for event in events:
+        if event == 'INSERT':
+            referencing = 'REFERENCING NEW TABLE AS new_rows'
+        elif event == 'UPDATE':
+            referencing = 'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows'
+        else:
+            referencing = 'REFERENCING OLD TABLE AS old_rows'
+        op.execute(
+            f'CREATE TRIGGER {table}_counters_{event.lower()} AFTER {event} ON {table} '
+            f'{referencing} FOR EACH STATEMENT EXECUTE FUNCTION {function}()'
+        )
+
+
+def upgrade() -> None:
+    op.create_table('user_counters',
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    *[sa.Column(column, sa.Integer(), server_default='0', nullable=False) for column in TASK_COUNTER_COLUMNS],
+    sa.Column('note_total', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('category_total', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+
+    task_columns = list(TASK_COUNTER_COLUMNS)
+    op.execute(_counter_function('user_counters_task_delta', task_columns, {
+        'INSERT': _task_deltas('SELECT owner_id, status, priority, 1 AS sign FROM new_rows'),
+        'UPDATE': _task_deltas(
+            'SELECT owner_id, status, priority, 1 AS sign FROM new_rows '
+            'UNION ALL SELECT owner_id, status, priority, -1 FROM old_rows'
+        ),
+        'DELETE': _task_deltas('SELECT owner_id, status, priority, -1 AS sign FROM old_rows'),
+    }))
+    op.execute(_counter_function('user_counters_note_delta', ['note_total'], {
+        'INSERT': 'SELECT owner_id, count(*) FROM new_rows GROUP BY owner_id',
+        'UPDATE': (
+            'SELECT owner_id, sum(sign) AS note_total FROM ('
+            'SELECT owner_id, 1 AS sign FROM new_rows '
+            'UNION ALL SELECT owner_id, -1 FROM old_rows) AS changes GROUP BY owner_id'
+        ),
+        'DELETE': 'SELECT owner_id, -count(*) AS note_total FROM old_rows GROUP BY owner_id',
+    }))
+    op.execute(_counter_function('user_counters_category_delta', ['category_total'], {
+        'INSERT': 'SELECT owner_id, count(*) FROM new_rows WHERE owner_id IS NOT NULL GROUP BY owner_id',
+        'UPDATE': (
+            'SELECT owner_id, sum(sign) AS category_total FROM ('
+            'SELECT owner_id, 1 AS sign FROM new_rows '
+            'UNION ALL SELECT owner_id, -1 FROM old_rows) AS changes '
+            'WHERE owner_id IS NOT NULL GROUP BY owner_id'
+        ),
+        'DELETE': (
+            'SELECT owner_id, -count(*) AS category_total FROM old_rows '
+            'WHERE owner_id IS NOT NULL GROUP BY owner_id'
+        ),
+    }))
+
+    _create_triggers('task', 'user_counters_task_delta', ['INSERT', 'UPDATE', 'DELETE'])
+    _create_triggers('notes', 'user_counters_note_delta', ['INSERT', 'UPDATE', 'DELETE'])
+    _create_triggers('categories', 'user_counters_category_delta', ['INSERT', 'UPDATE', 'DELETE'])
+
+    task_counts = ', '.join(
+        f'count(*) FILTER (WHERE {condition}) AS {column}'
+        for column, condition in TASK_COUNTER_COLUMNS.items()
+    )
+    op.execute(f"""
+        INSERT INTO user_counters (owner_id, {', '.join(task_columns)}, note_total, category_total)
+        SELECT u.id, {', '.join(f'coalesce(t.{column}, 0)' for column in task_columns)},
+               coalesce(n.note_total, 0), coalesce(c.category_total, 0)
+        FROM "user" AS u
+        LEFT JOIN (SELECT owner_id, {task_counts} FROM task GROUP BY owner_id) AS t ON t.owner_id = u.id
+        LEFT JOIN (SELECT owner_id, count(*) AS note_total FROM notes GROUP BY owner_id) AS n ON n.owner_id = u.id
+        LEFT JOIN (SELECT owner_id, count(*) AS category_total FROM categories GROUP BY owner_id) AS c ON c.owner_id = u.id
+    """)
+
+
+def downgrade() -> None:
+    for table in ('task', 'notes', 'categories'):
+        for event in ('insert', 'update', 'delete'):
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_counters_{event} ON {table}')
+    for function in ('user_counters_task_delta', 'user_counters_note_delta', 'user_counters_category_delta'):
+        op.execute(f'DROP FUNCTION IF EXISTS {function}()')
+    op.drop_table('user_counters')
@@ -0,0 +1,43 @@
+"""task position
+
+Revision ID: d2a9c4e7f615
+Revises: 8b4f2c6e1d37
+Create Date: 2026-10-18 22:31:26.448915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a9c4e7f615'
+down_revision: Union[str, None] = '8b4f2c6e1d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Byte order, the keys' digits are compared by their ASCII codes.
+    # Existing tasks start unplaced and the rebalancer places them in
+    # creation order.
+    op.add_column('task', sa.Column('position', sa.String(collation='C'), nullable=True))
+    op.drop_index('ix_task_owner_id_status_created_at_id', table_name='task')
+    op.create_index(
+        'ix_task_owner_id_status_position_id', 'task', ['owner_id', 'status', 'position', 'id'], unique=False
+    )
+    # Keep in sync with app.api.rebalancer.POSITION_MAX_LENGTH
+    op.create_index(
+        'ix_task_unbalanced_position', 'task', ['owner_id', 'status'], unique=False,
+        postgresql_where=sa.text("position IS NULL OR length(position) > 24"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_unbalanced_position', table_name='task')
+    op.drop_index('ix_task_owner_id_status_position_id', table_name='task')
+    op.create_index(
+        'ix_task_owner_id_status_created_at_id', 'task', ['owner_id', 'status', 'created_at', 'id'], unique=False
+    )
+    op.drop_column('task', 'position')
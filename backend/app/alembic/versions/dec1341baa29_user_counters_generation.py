@@ -0,0 +1,118 @@
+"""user counters generation
+
+Revision ID: dec1341baa29
+Revises: 7d90ab4e15f2
+Create Date: 2026-10-18 15:41:09.518236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dec1341baa29'
+down_revision: Union[str, None] = '7d90ab4e15f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASK_COUNTER_COLUMNS = {
+    'task_total': 'true',
+    'task_pending': "status = 'PENDING'",
+    'task_in_progress': "status = 'IN_PROGRESS'",
+    'task_completed': "status = 'COMPLETED'",
+    'task_cancelled': "status = 'CANCELLED'",
+    'task_high': "priority = 'HIGH'",
+    'task_medium': "priority = 'MEDIUM'",
+    'task_low': "priority = 'LOW'",
+}
+
+
+def _task_deltas(source: str) -> str:
+    sums = ', '.join(
+        f'sum(CASE WHEN {condition} THEN sign ELSE 0 END) AS {column}'
+        for column, condition in TASK_COUNTER_COLUMNS.items()
+    )
+    return f'SELECT owner_id, {sums} FROM ({source}) AS changes GROUP BY owner_id'
+
+
+def _counter_function(name: str, columns: list[str], deltas: dict[str, str], bump_generation: bool) -> str:
+    """
+    Same trigger functions as the user_counters revision, optionally bumping
+    the owner's generation once per statement. A row created by the trigger
+    starts at generation 1, a user without a row reads as generation 0.
+    """
+    upsert_set = [f'{column} = c.{column} + EXCLUDED.{column}' for column in columns]
+    update_set = [f'{column} = c.{column} + d.{column}' for column in columns]
+    insert_deltas = deltas['INSERT']
+    if bump_generation:
+        upsert_set.append('generation = c.generation + 1')
+        update_set.append('generation = c.generation + 1')
+        columns = [*columns, 'generation']
+        insert_deltas = f'SELECT d.*, 1 FROM ({insert_deltas}) AS d'
+    column_list = ', '.join(columns)
+    return f"""
+        CREATE OR REPLACE FUNCTION {name}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO user_counters AS c (owner_id, {column_list})
+                {insert_deltas}
+                ON CONFLICT (owner_id) DO UPDATE SET {', '.join(upsert_set)};
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE user_counters AS c SET {', '.join(update_set)}
+                FROM ({deltas['UPDATE']}) AS d
+                WHERE c.owner_id = d.owner_id;
+            ELSE
+                UPDATE user_counters AS c SET {', '.join(update_set)}
+                FROM ({deltas['DELETE']}) AS d
+                WHERE c.owner_id = d.owner_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """
+
+
+def _replace_functions(bump_generation: bool) -> None:
+    op.execute(_counter_function('user_counters_task_delta', list(TASK_COUNTER_COLUMNS), {
+        'INSERT': _task_deltas('SELECT owner_id, status, priority, 1 AS sign FROM new_rows'),
+        'UPDATE': _task_deltas(
+            'SELECT owner_id, status, priority, 1 AS sign FROM new_rows '
+            'UNION ALL SELECT owner_id, status, priority, -1 FROM old_rows'
+        ),
+        'DELETE': _task_deltas('SELECT owner_id, status, priority, -1 AS sign FROM old_rows'),
+    }, bump_generation))
+    op.execute(_counter_function('user_counters_note_delta', ['note_total'], {
+        'INSERT': 'SELECT owner_id, count(*) FROM new_rows GROUP BY owner_id',
+        'UPDATE': (
+            'SELECT owner_id, sum(sign) AS note_total FROM ('
+            'SELECT owner_id, 1 AS sign FROM new_rows '
+            'UNION ALL SELECT owner_id, -1 FROM old_rows) AS changes GROUP BY owner_id'
+        ),
+        'DELETE': 'SELECT owner_id, -count(*) AS note_total FROM old_rows GROUP BY owner_id',
+    }, bump_generation))
+    op.execute(_counter_function('user_counters_category_delta', ['category_total'], {
+        'INSERT': 'SELECT owner_id, count(*) FROM new_rows WHERE owner_id IS NOT NULL GROUP BY owner_id',
+        'UPDATE': (
+            'SELECT owner_id, sum(sign) AS category_total FROM ('
+            'SELECT owner_id, 1 AS sign FROM new_rows '
+            'UNION ALL SELECT owner_id, -1 FROM old_rows) AS changes '
+            'WHERE owner_id IS NOT NULL GROUP BY owner_id'
+        ),
+        'DELETE': (
+            'SELECT owner_id, -count(*) AS category_total FROM old_rows '
+            'WHERE owner_id IS NOT NULL GROUP BY owner_id'
+        ),
+    }, bump_generation))
+
+
+def upgrade() -> None:
+    op.add_column('user_counters', sa.Column('generation', sa.BigInteger(), server_default='0', nullable=False))
+    _replace_functions(bump_generation=True)
+
+
+def downgrade() -> None:
+    _replace_functions(bump_generation=False)
+    op.drop_column('user_counters', 'generation')
@@ -0,0 +1,30 @@
+"""task category cascade
+
+Revision ID: e83b5d02c6a4
+Revises: c41e9a8f3b27
+Create Date: 2026-10-18 13:27:09.654718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e83b5d02c6a4'
+down_revision: Union[str, None] = 'c41e9a8f3b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Deleting a category already removed its tasks through the ORM cascade,
+    # let the database do it so categories can be deleted set-based
+    op.drop_constraint('task_categories_id_fkey', 'task', type_='foreignkey')
+    op.create_foreign_key('task_categories_id_fkey', 'task', 'categories', ['categories_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    op.drop_constraint('task_categories_id_fkey', 'task', type_='foreignkey')
+    op.create_foreign_key('task_categories_id_fkey', 'task', 'categories', ['categories_id'], ['id'])
@@ -0,0 +1,83 @@
+"""task position sync
+
+Revision ID: f3c81b2d6a49
+Revises: d2a9c4e7f615
+Create Date: 2026-10-19 09:12:47.205318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c81b2d6a49'
+down_revision: Union[str, None] = 'd2a9c4e7f615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with app.core.realtime
+CHANNEL = 'task_events'
+MAX_EVENT_IDS = 100
+
+# position is part of TaskPublic: a reorder has to move updated_at for delta
+# sync and be announced over WebSocket/SSE like any other edit
+OLD_COLUMNS = ('title', 'description', 'status', 'priority', 'due_date', 'categories_id')
+SYNCED_COLUMNS = (*OLD_COLUMNS, 'position')
+VISIBLE_COLUMNS = SYNCED_COLUMNS
+
+
+def _notify(event_type: str, source: str) -> str:
+    """
+    One NOTIFY per owner and statement, with the ids of the tasks of source
+    """
+    return f"""
+        PERFORM pg_notify('{CHANNEL}', event::text) FROM (
+            SELECT json_build_object(
+                'type', '{event_type}',
+                'owner_id', owner_id,
+                'count', count(*),
+                'ids', CASE WHEN count(*) <= {MAX_EVENT_IDS} THEN json_agg(id) END
+            ) AS event
+            FROM ({source}) AS changes
+            GROUP BY owner_id
+        ) AS events;
+    """
+
+
+def _publish_events(columns: tuple[str, ...]) -> None:
+    changed = ' OR '.join(f'n.{column} IS DISTINCT FROM o.{column}' for column in columns)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION task_publish_events() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {_notify('task.created', 'SELECT id, owner_id FROM new_rows')}
+            ELSIF TG_OP = 'UPDATE' THEN
+                {_notify('task.updated', f'SELECT n.id, n.owner_id FROM new_rows AS n JOIN old_rows AS o ON o.id = n.id WHERE {changed}')}
+            ELSE
+                {_notify('task.deleted', 'SELECT id, owner_id FROM old_rows')}
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+
+
+def _touch_updated_at(columns: tuple[str, ...]) -> None:
+    op.execute('DROP TRIGGER IF EXISTS task_touch_updated_at ON task')
+    op.execute(
+        f"CREATE TRIGGER task_touch_updated_at BEFORE INSERT OR UPDATE OF {', '.join(columns)} "
+        "ON task FOR EACH ROW EXECUTE FUNCTION task_touch_updated_at()"
+    )
+
+
+def upgrade() -> None:
+    _touch_updated_at(SYNCED_COLUMNS)
+    _publish_events(VISIBLE_COLUMNS)
+
+
+def downgrade() -> None:
+    _publish_events(OLD_COLUMNS)
+    _touch_updated_at(OLD_COLUMNS)
@@ -0,0 +1,26 @@
+"""task keyset pagination index
+
+Revision ID: f7e206105806
+Revises: 5954fd6a31b0
+Create Date: 2026-10-18 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7e206105806'
+down_revision: Union[str, None] = '5954fd6a31b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_task_owner_id_created_at_id', 'task', ['owner_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_owner_id_created_at_id', table_name='task')
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import String, cast, delete, func, insert, null, union_all
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.timestamps import utc_now
+from app.models import ETaskStatus, Notes, NotesArchive, Task, TaskArchive
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = (ETaskStatus.COMPLETED, ETaskStatus.CANCELLED)
+
+# Columns moved as they are, the archive table has the same ones
+TASK_COLUMNS = [
+    "id", "title", "description", "status", "priority", "due_date",
+    "created_at", "updated_at", "owner_id", "categories_id", "version",
+]
+NOTE_COLUMNS = ["id", "title", "description", "task_id", "owner_id", "version"]
+
+
+def archive_batch(session: Session, older_than: timedelta, batch_size: int) -> int:
+    """
+    Move a batch of the oldest closed tasks, and their notes, to the archive
+    tables in a single statement: the DELETE ... RETURNING of both feed the
+    INSERTs into task_archive and notes_archive. Candidates come from
+    ix_task_closed_updated_at and rows locked by a writer or another worker
+    are skipped. Returns the number of tasks moved.
+    """
+    candidates = (
+        select(Task.id)
+        .where(
+            Task.status.in_(CLOSED_STATUSES),
+            Task.updated_at < utc_now() - older_than,
+        )
+        .order_by(Task.updated_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved_tasks = (
+        delete(Task)
+        .where(Task.id.in_(candidates.scalar_subquery()))
+        .returning(*(Task.__table__.c[name] for name in TASK_COLUMNS))
+        .cte("moved_tasks")
+    )
+    moved_notes = (
+        delete(Notes)
+        .where(Notes.task_id.in_(select(moved_tasks.c.id)))
+        .returning(*(Notes.__table__.c[name] for name in NOTE_COLUMNS))
+        .cte("moved_notes")
+    )
+    archived_tasks = (
+        insert(TaskArchive)
+        .from_select(
+            [*TASK_COLUMNS, "archived_at"],
+            select(*(moved_tasks.c[name] for name in TASK_COLUMNS), utc_now()),
+        )
+        .returning(TaskArchive.id)
+        .cte("archived_tasks")
+    )
+    archived_notes = (
+        insert(NotesArchive)
+        .from_select(NOTE_COLUMNS, select(*(moved_notes.c[name] for name in NOTE_COLUMNS)))
+        .cte("archived_notes")
+    )
+    statement = select(func.count()).select_from(archived_tasks).add_cte(archived_notes)
+    return session.execute(statement).scalar_one()
+
+
+def archive_closed_tasks() -> int:
+    """
+    One pass of the archiver. Each batch commits on its own and the next one
+    waits ARCHIVE_BATCH_PAUSE_SECONDS, so a large backlog is drained without
+    long transactions or a burst of WAL.
+    """
+    older_than = timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    archived = 0
+    with Session(engine) as session:
+        while True:
+            moved = archive_batch(session, older_than, settings.ARCHIVE_BATCH_SIZE)
+            session.commit()
+            archived += moved
+            if moved < settings.ARCHIVE_BATCH_SIZE:
+                return archived
+            time.sleep(settings.ARCHIVE_BATCH_PAUSE_SECONDS)
+
+
+async def run_archiver() -> None:
+    """
+    Background loop of the archiver, started with the app
+    """
+    while True:
+        try:
+            archived = await asyncio.to_thread(archive_closed_tasks)
+            if archived:
+                logger.info("Archived %d closed tasks", archived)
+        except Exception:
+            logger.exception("Task archiving failed")
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
+
+
+def tasks_with_archive(owner_id: uuid.UUID) -> Any:
+    """
+    The owner's tasks and archived tasks as one subquery with the columns of
+    task that the list endpoint reads. Postgres pushes the filters and the
+    ORDER BY ... LIMIT down into both branches, so each side still runs on
+    its (owner_id, created_at, id) index. Archived tasks are off the board,
+    their position is null.
+    """
+    names = [*TASK_COLUMNS, "search_vector"]
+    return union_all(
+        select(*(Task.__table__.c[name] for name in names), Task.position).where(Task.owner_id == owner_id),
+        select(
+            *(TaskArchive.__table__.c[name] for name in names), cast(null(), String).label("position")
+        ).where(TaskArchive.owner_id == owner_id),
+    ).subquery("task")
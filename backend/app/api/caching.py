@@ -0,0 +1,94 @@
+import hashlib
+import uuid
+
+from fastapi import HTTPException, Request, Response
+from sqlmodel import Session, select
+
+from app.models import UserCounters
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def _opaque_tag(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def owner_etag(session: Session, owner_id: uuid.UUID, resource: str) -> str:
+    """
+    Weak ETag of a resource of the owner, derived from the change generation
+    the user_counters triggers bump on every task, note and category write.
+    The generation is read before the data, so a write racing the read can
+    only make the tag older than the body, never newer. A user without
+    counters yet reads as generation 0, the first write creates them at 1.
+    """
+    generation = session.exec(
+        select(UserCounters.generation).where(UserCounters.owner_id == owner_id)
+    ).first() or 0
+    digest = hashlib.blake2b(
+        f"{owner_id}:{generation}:{resource}".encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _tag_or_not_modified(
+    request: Request, response: Response, etag: str, exists: bool
+) -> Response | None:
+    """
+    Call once the request is validated. "*" only matches when exists, i.e.
+    the caller already looked the resource up.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+        if (exists and "*" in tags) or _opaque_tag(etag) in tags:
+            return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
+def conditional_get(
+    session: Session, request: Request, response: Response, owner_id: uuid.UUID
+) -> Response | None:
+    """
+    Tag the response with the owner's ETag.
+    Returns a 304 to send instead when the client's copy is still current.
+    Call it after validating the request. "*" is not honoured: the list is
+    only known once queried, so only an exact tag proves the copy current.
+    """
+    resource = request.url.path
+    if request.url.query:
+        resource = f"{resource}?{request.url.query}"
+    return _tag_or_not_modified(request, response, owner_etag(session, owner_id, resource), exists=False)
+
+
+def version_etag(version: int) -> str:
+    """
+    Strong ETag of a single row, its version column
+    """
+    return f'"{version}"'
+
+
+def conditional_get_version(request: Request, response: Response, version: int) -> Response | None:
+    """
+    conditional_get for a single row, tagged with its version so the same
+    tag can be sent back as If-Match to update it
+    """
+    # The row was just loaded, so it exists and "*" matches it
+    return _tag_or_not_modified(request, response, version_etag(version), exists=True)
+
+
+def expected_version(request: Request, version: int | None) -> int | None:
+    """
+    Version a write is based on: the If-Match header, else the version sent
+    in the body. None when the client asked for an unconditional write.
+    """
+    if_match = request.headers.get("if-match")
+    if not if_match or if_match.strip() == "*":
+        return version
+    try:
+        return int(_opaque_tag(if_match).strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be the ETag of the row")
@@ -1,17 +1,88 @@
-from sqlmodel import select, and_
-from app.api.deps import CurrentUser, SessionDep
-from app.models import Task
-from datetime import datetime
+import asyncio
+import logging
+import uuid
+from collections import defaultdict
+from typing import Any
 
-def get_overdue_tasks(session: SessionDep, current_user: CurrentUser):
-    statement = (
-        select(Task)
+from sqlalchemy import Row, update
+from sqlmodel import Session, select
+
+from app.core import realtime
+from app.core.config import settings
+from app.core.db import engine
+from app.core.timestamps import utc_now
+from app.models import ETaskStatus, Task
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = (ETaskStatus.COMPLETED, ETaskStatus.CANCELLED)
+
+
+def claim_overdue_tasks(session: Session, batch_size: int) -> list[Row[Any]]:
+    """
+    Mark a batch of overdue open tasks of every owner as notified and return
+    them. Walks ix_task_overdue_due_date, which only holds tasks still to
+    report, and skips rows another worker is claiming at the same time.
+    """
+    overdue = (
+        select(Task.id)
         .where(
-            and_(
-                Task.owner_id == current_user.id,
-                Task.due_date <= datetime.now(),
-                Task.status != "Completed"
-            )
+            Task.due_date.is_not(None),
+            Task.due_date <= utc_now(),
+            Task.overdue_notified_at.is_(None),
+            Task.status.not_in(CLOSED_STATUSES),
         )
+        .order_by(Task.due_date)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    statement = (
+        update(Task)
+        .where(Task.id.in_(overdue.scalar_subquery()))
+        .values(overdue_notified_at=utc_now())
+        .returning(Task.id, Task.owner_id, Task.title, Task.due_date)
+        .execution_options(synchronize_session=False)
     )
-    return session.exec(statement).all()
+    return list(session.execute(statement).all())
+
+
+def notify_overdue(session: Session, tasks: list[Row[Any]]) -> None:
+    """
+    Push a task.overdue event to the owners of the tasks, sent on commit
+    together with the claim
+    """
+    by_owner: dict[uuid.UUID, list[uuid.UUID]] = defaultdict(list)
+    for task in tasks:
+        by_owner[task.owner_id].append(task.id)
+    realtime.publish(session, (
+        realtime.task_event("task.overdue", owner_id, task_ids)
+        for owner_id, task_ids in by_owner.items()
+    ))
+
+
+def scan_overdue_tasks() -> int:
+    """
+    One pass of the scanner, batch by batch until nothing is left to report
+    """
+    notified = 0
+    with Session(engine) as session:
+        while True:
+            tasks = claim_overdue_tasks(session, settings.OVERDUE_SCAN_BATCH_SIZE)
+            if not tasks:
+                return notified
+            notify_overdue(session, tasks)
+            session.commit()
+            notified += len(tasks)
+
+
+async def run_overdue_scanner() -> None:
+    """
+    Background loop of the overdue scanner, started with the app.
+    Every worker runs one, SKIP LOCKED keeps them from claiming the same task.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(scan_overdue_tasks)
+        except Exception:
+            logger.exception("Overdue task scan failed")
+        await asyncio.sleep(settings.OVERDUE_SCAN_INTERVAL_SECONDS)
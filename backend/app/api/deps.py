@@ -2,7 +2,7 @@ from collections.abc import Generator
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
@@ -27,7 +27,7 @@ SessionDep = Annotated[Session, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def get_user_from_token(session: Session, token: str) -> User:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -46,9 +46,26 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
     return user
 
 
+def get_current_user(session: SessionDep, token: TokenDep) -> User:
+    return get_user_from_token(session, token)
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+def get_stream_user(token: str = Query()) -> User:
+    """
+    User of a WebSocket or SSE connection. Browsers can't set headers on
+    those, so the token comes as a query parameter, and the session is closed
+    right away instead of being held for as long as the connection lives.
+    """
+    with Session(engine) as session:
+        return get_user_from_token(session, token)
+
+
+StreamUser = Annotated[User, Depends(get_stream_user)]
+
+
 def get_current_active_superuser(current_user: CurrentUser) -> User:
     if not current_user.is_superuser:
         raise HTTPException(
@@ -0,0 +1,229 @@
+import csv
+import io
+import os
+import shutil
+import tempfile
+import uuid
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any, BinaryIO
+
+from pydantic import ValidationError
+from sqlalchemy import text, update
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.core.scheduler import reminders
+from app.core.timestamps import naive_utc
+from app.models import EFileFormat, EImportStatus, TaskCreate, TaskImportJob
+
+# Only the first errors are kept on the job, the rest are just counted
+MAX_REPORTED_ERRORS = 100
+# Rows between two progress updates of the job
+PROGRESS_EVERY = 10_000
+
+STAGING_COLUMNS = (
+    "line",
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "created_at",
+    "updated_at",
+    "categories_id",
+)
+TASK_COLUMNS = STAGING_COLUMNS[1:]
+
+CREATE_STAGING = text(
+    """
+    CREATE TEMP TABLE task_import_staging (
+        line integer NOT NULL,
+        id uuid NOT NULL,
+        title varchar(255) NOT NULL,
+        description varchar,
+        status etaskstatus NOT NULL,
+        priority etaskpriority NOT NULL,
+        due_date timestamp,
+        created_at timestamp NOT NULL,
+        updated_at timestamp NOT NULL,
+        categories_id uuid
+    ) ON COMMIT DROP
+    """
+)
+
+# Categories are resolved for the whole file at once: rows pointing to a
+# category the owner doesn't have are simply not selected
+INSERT_FROM_STAGING = text(
+    f"""
+    WITH inserted AS (
+        INSERT INTO task ({", ".join(TASK_COLUMNS)}, owner_id)
+        SELECT {", ".join(f"s.{column}" for column in TASK_COLUMNS)}, :owner_id
+        FROM task_import_staging AS s
+        WHERE s.categories_id IS NULL
+           OR s.categories_id IN (SELECT c.id FROM categories AS c WHERE c.owner_id = :owner_id)
+        RETURNING id, due_date
+    )
+    SELECT id, due_date FROM inserted
+    """
+)
+
+SELECT_UNKNOWN_CATEGORY_LINES = text(
+    """
+    SELECT s.line FROM task_import_staging AS s
+    WHERE s.categories_id IS NOT NULL
+      AND s.categories_id NOT IN (SELECT c.id FROM categories AS c WHERE c.owner_id = :owner_id)
+    ORDER BY s.line
+    LIMIT :limit
+    """
+)
+
+
+def _iter_records(stream: BinaryIO, file_format: EFileFormat) -> Iterator[tuple[int, Any]]:
+    """
+    Yield (line number, raw record) without reading the whole file
+    """
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if file_format == EFileFormat.CSV:
+        reader = csv.DictReader(text_stream)
+        for record in reader:
+            # Empty cells fall back to the TaskCreate defaults
+            yield reader.line_num, {
+                key: value for key, value in record.items() if key and value
+            }
+    else:
+        for line_number, line in enumerate(text_stream, start=1):
+            if line.strip():
+                yield line_number, line
+
+
+def _validate(record: Any) -> TaskCreate:
+    if isinstance(record, str):
+        return TaskCreate.model_validate_json(record)
+    return TaskCreate.model_validate(record)
+
+
+def _report_error(job: TaskImportJob, line: int | None, error: str) -> None:
+    if len(job.errors) < MAX_REPORTED_ERRORS:
+        job.errors.append({"line": line, "error": error})
+
+
+def _save_progress(job: TaskImportJob) -> None:
+    """
+    Persist the job counters on their own connection, so progress is visible
+    while the import transaction is still open
+    """
+    with Session(engine) as session:
+        session.execute(
+            update(TaskImportJob)
+            .where(TaskImportJob.id == job.id)
+            .values(
+                status=job.status,
+                processed_rows=job.processed_rows,
+                imported_rows=job.imported_rows,
+                failed_rows=job.failed_rows,
+                errors=job.errors,
+                finished_at=job.finished_at,
+            )
+        )
+        session.commit()
+
+
+def _stage_rows(session: Session, job: TaskImportJob, stream: BinaryIO) -> int:
+    """
+    Validate the records one by one and COPY the valid ones into a temporary
+    staging table. Returns the number of staged rows.
+    """
+    session.execute(CREATE_STAGING)
+    staged = 0
+    driver_connection = session.connection().connection.driver_connection
+    with driver_connection.cursor() as cursor:
+        with cursor.copy(
+            f"COPY task_import_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN"
+        ) as copy:
+            for line, record in _iter_records(stream, job.format):
+                job.processed_rows += 1
+                try:
+                    task = _validate(record)
+                except ValidationError as e:
+                    job.failed_rows += 1
+                    error = e.errors()[0]
+                    location = ".".join(str(part) for part in error["loc"])
+                    _report_error(job, line, f"{location}: {error['msg']}" if location else error["msg"])
+                else:
+                    copy.write_row((
+                        line,
+                        uuid.uuid4(),
+                        task.title,
+                        task.description,
+                        task.status.name,
+                        task.priority.name,
+                        naive_utc(task.due_date) if task.due_date else None,
+                        naive_utc(task.created_at),
+                        naive_utc(task.updated_at),
+                        task.categories_id,
+                    ))
+                    staged += 1
+                if job.processed_rows % PROGRESS_EVERY == 0:
+                    _save_progress(job)
+    return staged
+
+
+def run_import(job_id: uuid.UUID, stream: BinaryIO) -> None:
+    """
+    Import the tasks of a job from an NDJSON or CSV stream, then record the
+    outcome on the job
+    """
+    with Session(engine) as session:
+        job = session.get(TaskImportJob, job_id)
+        if not job:
+            return
+        session.expunge(job)
+        job.status = EImportStatus.RUNNING
+        _save_progress(job)
+        try:
+            staged = _stage_rows(session, job, stream)
+            due_dates = []
+            job.imported_rows = 0
+            for task_id, due_date in session.execute(INSERT_FROM_STAGING, {"owner_id": job.owner_id}):
+                job.imported_rows += 1
+                if due_date is not None:
+                    due_dates.append((task_id, due_date))
+            if job.imported_rows < staged:
+                job.failed_rows += staged - job.imported_rows
+                lines = session.execute(
+                    SELECT_UNKNOWN_CATEGORY_LINES,
+                    {"owner_id": job.owner_id, "limit": MAX_REPORTED_ERRORS},
+                ).scalars()
+                for line in lines:
+                    _report_error(job, line, "categories_id: Category not found")
+            session.commit()
+            job.status = EImportStatus.COMPLETED
+            # Like a created task, once the rows are visible to the scheduler
+            for task_id, due_date in due_dates:
+                reminders.schedule(task_id, due_date)
+        except Exception as e:
+            session.rollback()
+            job.imported_rows = 0
+            job.status = EImportStatus.FAILED
+            _report_error(job, None, str(e))
+        job.finished_at = datetime.utcnow()
+        _save_progress(job)
+
+
+def spool_upload(upload: BinaryIO) -> str:
+    """
+    Copy an upload to a file that outlives the request for a background import
+    """
+    with tempfile.NamedTemporaryFile(prefix="task-import-", delete=False) as spool:
+        shutil.copyfileobj(upload, spool)
+    return spool.name
+
+
+def run_import_file(job_id: uuid.UUID, path: str) -> None:
+    try:
+        with open(path, "rb") as stream:
+            run_import(job_id, stream)
+    finally:
+        os.unlink(path)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import tasks, login, private, users, utils, categories, notes
+from app.api.routes import tasks, login, private, users, utils, categories, notes, events
 from app.core.config import settings
 
 api_router = APIRouter()
@@ -10,6 +10,7 @@ api_router.include_router(utils.router)
 api_router.include_router(tasks.router)
 api_router.include_router(categories.router)
 api_router.include_router(notes.router)
+api_router.include_router(events.router)
 
 
 if settings.ENVIRONMENT == "local":
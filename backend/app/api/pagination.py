@@ -0,0 +1,116 @@
+import base64
+import binascii
+import json
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, tuple_
+from sqlmodel import Session, select
+
+from app.models import ECountMode, UserCounters
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Pack the sort key of the last row of a page into an opaque cursor
+    """
+    payload = [
+        value.isoformat() if isinstance(value, datetime)
+        else str(value) if isinstance(value, uuid.UUID)
+        else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """
+    Unpack a cursor produced by encode_cursor, 400 if it was tampered with
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return payload
+
+
+def decode_created_at_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    Decode a (created_at, id) cursor
+    """
+    payload = decode_cursor(cursor)
+    try:
+        created_at, task_id = payload
+        return datetime.fromisoformat(created_at), uuid.UUID(task_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def decode_sort_cursor(
+    cursor: str, sort: str, direction: str, parse_value: Callable[[Any], Any]
+) -> tuple[Any, uuid.UUID]:
+    """
+    Decode a (sort, direction, value, id) cursor, 400 if it was made for
+    another sort order
+    """
+    payload = decode_cursor(cursor)
+    try:
+        cursor_sort, cursor_direction, value, last_id = payload
+        if (cursor_sort, cursor_direction) != (sort, direction):
+            raise HTTPException(status_code=400, detail="Cursor does not match the sort order")
+        return (None if value is None else parse_value(value)), uuid.UUID(last_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def seek_after(
+    column: Any,
+    id_column: Any,
+    after: tuple[Any, uuid.UUID],
+    descending: bool = False,
+    nullable: bool = False,
+) -> Any:
+    """
+    Keyset condition for the rows after the cursor in ORDER BY column, id
+    (both ascending or both descending). NULLs sort as Postgres does by
+    default and as its indexes store them: last ascending, first descending.
+    """
+    value, last_id = after
+    if not nullable:
+        return tuple_(column, id_column) < after if descending else tuple_(column, id_column) > after
+    if descending:
+        if value is None:
+            return or_(column.is_not(None), and_(column.is_(None), id_column < last_id))
+        return tuple_(column, id_column) < after
+    if value is None:
+        return and_(column.is_(None), id_column > last_id)
+    return or_(tuple_(column, id_column) > after, column.is_(None))
+
+
+def resolve_count(
+    session: Session,
+    count_mode: ECountMode,
+    exact_statement: Any,
+    owner_id: uuid.UUID,
+    cached_column: Any | None = None,
+) -> int | None:
+    """
+    Total for a list endpoint according to count_mode.
+    Pass cached_column only when the counter covers exactly the filtered
+    rows, otherwise the cached mode falls back to exact_statement.
+    """
+    if count_mode == ECountMode.NONE:
+        return None
+    if count_mode == ECountMode.CACHED and cached_column is not None:
+        cached = session.exec(
+            select(cached_column).where(UserCounters.owner_id == owner_id)
+        ).first()
+        return cached or 0
+    return session.execute(exact_statement).scalar_one()
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import uuid
+
+from sqlalchemy import String, Uuid, column, func, update, values
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.fractional_index import spread_keys
+from app.core.timestamps import utc_now
+from app.models import ETaskStatus, Task
+
+logger = logging.getLogger(__name__)
+
+# Keys grow by about one digit every six moves into the same gap. Past this
+# length the column is respaced (keep in sync with ix_task_unbalanced_position).
+POSITION_MAX_LENGTH = 24
+
+
+def rebalance_column(session: Session, owner_id: uuid.UUID, status: ETaskStatus) -> int:
+    """
+    Give the tasks of a board column fresh, evenly spaced keys in their
+    current order, unplaced tasks last by creation. The column's rows are
+    locked while it is rewritten, a concurrent move locks its neighbours
+    and so computes its key from either the old or the new ones. Returns
+    the number of tasks updated.
+    """
+    task_ids = session.exec(
+        select(Task.id)
+        .where(Task.owner_id == owner_id, Task.status == status)
+        .order_by(Task.position, Task.created_at, Task.id)
+        .with_for_update()
+    ).all()
+    if not task_ids:
+        return 0
+    keys = values(column("id", Uuid), column("position", String), name="keys").data(
+        list(zip(task_ids, spread_keys(len(task_ids))))
+    )
+    # position is part of TaskPublic, so this is a change like any other:
+    # new version (ETag) and updated_at, for the single reads and delta sync
+    session.execute(
+        update(Task)
+        .where(Task.id == keys.c.id)
+        .values(position=keys.c.position, updated_at=utc_now(), version=Task.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return len(task_ids)
+
+
+def rebalance_positions() -> int:
+    """
+    One pass of the rebalancer over the columns with unplaced tasks or
+    keys grown past POSITION_MAX_LENGTH, one transaction per column
+    """
+    rebalanced = 0
+    with Session(engine) as session:
+        columns = session.exec(
+            select(Task.owner_id, Task.status)
+            .where(Task.position.is_(None) | (func.length(Task.position) > POSITION_MAX_LENGTH))
+            .distinct()
+            .limit(settings.POSITION_REBALANCE_BATCH_SIZE)
+        ).all()
+        for owner_id, status in columns:
+            rebalance_column(session, owner_id, status)
+            session.commit()
+            rebalanced += 1
+    return rebalanced
+
+
+async def run_rebalancer() -> None:
+    """
+    Background loop of the position rebalancer, started with the app
+    """
+    while True:
+        try:
+            await asyncio.to_thread(rebalance_positions)
+        except Exception:
+            logger.exception("Task position rebalancing failed")
+        await asyncio.sleep(settings.POSITION_REBALANCE_INTERVAL_SECONDS)
@@ -1,11 +1,16 @@
 import uuid
 from typing import Any, List, Optional
 from uuid import UUID  
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from sqlmodel import func, select
 
+from app import crud
+from app.api.caching import conditional_get, conditional_get_version, expected_version, version_etag
 from app.api.deps import CurrentUser, SessionDep
-from app.models import Categories, CategoryPublic, CategoriesPublic, CategoriesUpdate, CategoriesCreate, Message, Task  
+from app.api.pagination import resolve_count
+from app.api.search import search_clauses
+from app.api.serialization import construct_all, json_response, parse_fields, public_columns, sparse_rows
+from app.models import Categories, CategoryPublic, CategoriesPublic, CategoriesUpdate, CategoriesCreate, ECountMode, ESearchMode, Message, Task, UserCounters
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
@@ -70,46 +75,67 @@ def get_tasks_by_category(*,
 def read_category(
     session: SessionDep, 
     current_user: CurrentUser,
+    request: Request,
+    response: Response,
     skip: int = 0, 
     limit: int = 100,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    search_mode: ESearchMode = ESearchMode.SUBSTRING,
+    count: ECountMode = ECountMode.CACHED,
+    fields: Optional[str] = None,
 ) -> Any: 
     """
     Retrieve Categories 
+    fields=id,title,... returns only those CategoryPublic fields
     """
+    selected = parse_fields(fields, CategoryPublic)
+
     # Initialize base statement and count statement
-    statement = select(Categories)
+    statement = select(*public_columns(Categories, CategoryPublic, selected))
     count_statement = select(func.count()).select_from(Categories)
     
     # Check for search and apply filter for both statement and count_statement
+    filter_condition = None
     if search:
-        filter_condition = (
-            (Categories.title.ilike(f"%{search}%")) | 
-            (Categories.description.ilike(f"%{search}%"))
-        )
+        filter_condition, rank = search_clauses(search, search_mode, (Categories.title, Categories.description))
         statement = statement.filter(filter_condition)
         count_statement = count_statement.filter(filter_condition)
+        if rank is not None:
+            statement = statement.order_by(rank.desc())
+
+    # A superuser lists every owner's categories, which no single generation covers
+    if not current_user.is_superuser:
+        not_modified = conditional_get(session, request, response, current_user.id)
+        if not_modified:
+            return not_modified
     
     # If the user is a superuser, fetch all categories
     if current_user.is_superuser:
-        categories_count = session.execute(count_statement).scalar_one()
+        # The per-owner counters can't answer a count across all owners
+        categories_count = resolve_count(session, count, count_statement, current_user.id)
         statement = statement.offset(skip).limit(limit)
-        categories = session.execute(statement).scalars().all()
+        categories = session.execute(statement).all()
     else:
         # If the user is not a superuser, fetch categories specific to the user
         count_statement = count_statement.filter(Categories.owner_id == current_user.id)
         statement = statement.filter(Categories.owner_id == current_user.id)
         
-        categories_count = session.execute(count_statement).scalar_one()
+        categories_count = resolve_count(
+            session, count, count_statement, current_user.id,
+            cached_column=UserCounters.category_total if filter_condition is None else None,
+        )
         statement = statement.offset(skip).limit(limit)
-        categories = session.execute(statement).scalars().all()
+        categories = session.execute(statement).all()
 
     # Return the result: categories and their count
-    return CategoriesPublic(data=categories, count=categories_count)
+    if selected:
+        return json_response({"data": sparse_rows(categories, selected), "count": categories_count}, response)
+    result = CategoriesPublic.model_construct(data=construct_all(CategoryPublic, categories), count=categories_count)
+    return json_response(result, response)
 
 
 @router.get('/{id}', response_model=CategoryPublic)
-def read_category(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_category(session: SessionDep, current_user: CurrentUser, request: Request, response: Response, id: uuid.UUID) -> Any:
     """
     Get category by ID 
     """
@@ -118,17 +144,22 @@ def read_category(session: SessionDep, current_user: CurrentUser, id: uuid.UUID)
         raise HTTPException(status_code=404, detail="Category Not Found")
     if not current_user.is_superuser and (category.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
+    not_modified = conditional_get_version(request, response, category.version)
+    if not_modified:
+        return not_modified
     return category
 
 @router.put("/{id}", response_model=CategoryPublic)
 def update_category(
     *, session: SessionDep,
     current_user: CurrentUser,
+    request: Request,
+    response: Response,
     id: uuid.UUID,
     category_in: CategoriesUpdate,
 ) -> Any: 
     """
-    Update a category
+    Update a category, only if it is still at the If-Match version when given
     """
     category = session.get(Categories, id)
     if not category:
@@ -136,10 +167,16 @@ def update_category(
     if not current_user.is_superuser and (category.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     update_dict = category_in.model_dump(exclude_unset=True)
+    version = expected_version(request, update_dict.pop("version", None))
+    if version is not None and category.version != version:
+        raise HTTPException(status_code=409, detail="Category was modified, reload it and retry")
     category.sqlmodel_update(update_dict)
     session.add(category)
+    # The UPDATE is guarded by the version as well, a concurrent write in
+    # between raises StaleDataError (409)
     session.commit()
     session.refresh(category)
+    response.headers["ETag"] = version_etag(category.version)
     return category
 
 @router.delete('/{id}')
@@ -162,23 +199,14 @@ def delete_categories(session: SessionDep, current_user: CurrentUser) -> Message
     """
     Delete all categories
     """
-    # Get the list of all categories
-    statement = select(Categories)
-    categories = session.exec(statement).all()
+    # One DELETE ... RETURNING id over the user's categories (every category
+    # for a superuser), their tasks and notes go with the cascade
+    owner_id = None if current_user.is_superuser else current_user.id
+    deleted = crud.delete_owned(session=session, model=Categories, owner_id=owner_id)
 
-    if not categories:
+    if not deleted:
+        session.rollback()
         raise HTTPException(status_code=404, detail="No Categories To Delete")
 
-    # Check the permission of the current_user (only delete if superuser or owner of the category)
-    if not current_user.is_superuser:
-        for category in categories:
-            if category.owner_id != current_user.id:
-                raise HTTPException(status_code=400, detail="Not enough permissions to delete this category")
-
-    # Delete all categories
-    for category in categories:
-        session.delete(category)
-
     session.commit()
     return Message(message="All categories deleted successfully")
-
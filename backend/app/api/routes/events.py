@@ -0,0 +1,63 @@
+import asyncio
+import json
+from typing import Any
+
+from fastapi import APIRouter, Request, WebSocket
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import StreamUser
+from app.core.realtime import hub
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Idle SSE streams send a comment this often so proxies keep them open
+HEARTBEAT_SECONDS = 15
+
+
+async def _send_events(websocket: WebSocket, queue: "asyncio.Queue[dict[str, Any]]") -> None:
+    while True:
+        await websocket.send_json(await queue.get())
+
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/ws")
+async def task_events_socket(websocket: WebSocket, current_user: StreamUser) -> None:
+    """
+    Push the task events of the current user: task.created, task.updated,
+    task.deleted, task.overdue and resync
+    """
+    await websocket.accept()
+    with hub.subscribe(current_user.id) as queue:
+        tasks = [
+            asyncio.create_task(_send_events(websocket, queue)),
+            asyncio.create_task(_wait_disconnect(websocket)),
+        ]
+        _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+
+
+@router.get("/stream")
+async def task_events_stream(request: Request, current_user: StreamUser) -> StreamingResponse:
+    """
+    Same events as the WebSocket, as Server-Sent Events
+    """
+    async def stream():
+        with hub.subscribe(current_user.id) as queue:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,11 +2,17 @@ from datetime import date, datetime
 import uuid
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from sqlalchemy.orm.exc import StaleDataError
 from sqlmodel import func, select
 
+from app import crud
+from app.api.caching import conditional_get, expected_version, version_etag
 from app.api.deps import CurrentUser, SessionDep
-from app.models import NoteCreate, Notes, Task, NotePublic, NotesPublic, NoteUpdate
+from app.api.pagination import resolve_count
+from app.api.search import search_clauses
+from app.api.serialization import construct_all, json_response, parse_fields, public_columns, sparse_rows
+from app.models import ECountMode, ESearchMode, NoteCreate, Notes, Task, NotePublic, NotesPublic, NoteUpdate, UserCounters
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
@@ -58,25 +64,52 @@ async def create_notes(
 def read_note(
     session: SessionDep, 
     current_user: CurrentUser,
+    request: Request,
+    response: Response,
     skip: int = 0, 
-    limit: int = 9999
+    limit: int = 9999,
+    search: Optional[str] = None,
+    search_mode: ESearchMode = ESearchMode.SUBSTRING,
+    count: ECountMode = ECountMode.CACHED,
+    fields: Optional[str] = None,
 ) -> Any: 
     """
     Retrieve Note 
+    fields=id,title,... returns only those NotePublic fields
     """
+    selected = parse_fields(fields, NotePublic)
+    filter_condition, rank = (
+        search_clauses(search, search_mode, (Notes.title, Notes.description))
+        if search else (None, None)
+    )
+    not_modified = conditional_get(session, request, response, current_user.id)
+    if not_modified:
+        return not_modified
     try:
+        owner_condition = Notes.owner_id == current_user.id
+        if filter_condition is not None:
+            owner_condition = owner_condition & filter_condition
+
         statement = (
-            select(Notes)
-            .where(Notes.owner_id == current_user.id)
+            select(*public_columns(Notes, NotePublic, selected))
+            .where(owner_condition)
             .offset(skip)
             .limit(limit)
         )
+        if rank is not None:
+            statement = statement.order_by(rank.desc())
         results = session.exec(statement).all()
 
-        count_statement = select(func.count()).where(Notes.owner_id == current_user.id).select_from(Notes)
-        count = session.exec(count_statement).one() 
+        count_statement = select(func.count()).where(owner_condition).select_from(Notes)
+        note_count = resolve_count(
+            session, count, count_statement, current_user.id,
+            cached_column=UserCounters.note_total if filter_condition is None else None,
+        )
 
-        return NotesPublic(data=results, count=count)
+        if selected:
+            return json_response({"data": sparse_rows(results, selected), "count": note_count}, response)
+        notes = NotesPublic.model_construct(data=construct_all(NotePublic, results), count=note_count)
+        return json_response(notes, response)
     except Exception as e:
         session.rollback()  
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
@@ -103,19 +136,26 @@ def get_notes_by_task_id(task_id: uuid.UUID, current_user: CurrentUser, session:
     
     
 @router.patch('/{note_id}', response_model=NotePublic)
-def update_note(*, session: SessionDep, current_user: CurrentUser, note_id: uuid.UUID, note_update: NoteUpdate):
+def update_note(*, session: SessionDep, current_user: CurrentUser, request: Request, response: Response, note_id: uuid.UUID, note_update: NoteUpdate):
     try: 
         note = session.get(Notes, note_id)
         if not note:
             raise HTTPException(status_code=404, detail="Note not found")
         if not current_user.is_superuser and note.owner_id != current_user.id:
             raise HTTPException(status_code=400, detail="Not enough permissions")
+        version = expected_version(request, note_update.version)
+        if version is not None and note.version != version:
+            raise HTTPException(status_code=409, detail="Note was modified, reload it and retry")
         note.title = note_update.title
         note.description = note_update.description
         session.add(note)
         session.commit()
         session.refresh(note)
+        response.headers["ETag"] = version_etag(note.version)
         return note
+    except (HTTPException, StaleDataError):
+        session.rollback()
+        raise
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
@@ -140,25 +180,23 @@ def delete_note(note_id: uuid.UUID, current_user: CurrentUser, session: SessionD
 @router.delete("/notes", response_model=dict)
 def delete_notes(note_ids: List[uuid.UUID], current_user: CurrentUser, session: SessionDep):
     try:
-        for note_id in note_ids:
-            note = session.get(Notes, note_id)
-            if not current_user.is_superuser and note.owner_id != current_user.id:
-                raise HTTPException(status_code=400, detail="Not enough permissions")
-            if not note:
-                raise HTTPException(status_code=404, detail=f"Note with id {note_id} not found")
-            if note.owner_id != current_user.id:
-                raise HTTPException(status_code=400, detail="Not enough permissions")
-            session.delete(note)
-            
-            # Update task's notes_id
-            # if note.task_id:
-            #     task = session.get(Task, note.task_id)
-            #     if task and task.notes_id:
-            #         task.notes_id = [nid for nid in task.notes_id if nid != note_id]
-            #         session.add(task)
-        
+        # One owner-scoped DELETE ... RETURNING id instead of a get and delete per note
+        owner_id = None if current_user.is_superuser else current_user.id
+        deleted = crud.delete_owned(session=session, model=Notes, owner_id=owner_id, ids=note_ids)
+
+        forbidden, missing = crud.partition_skipped_ids(
+            session=session, model=Notes, requested=note_ids, affected=deleted, owner_id=owner_id
+        )
+        if forbidden:
+            raise HTTPException(status_code=400, detail="Not enough permissions")
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Note with id {missing[0]} not found")
+
         session.commit()
         return {"message": "Notes deleted successfully"}
+    except HTTPException:
+        session.rollback()
+        raise
     except Exception as e:
         session.rollback()
-        raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
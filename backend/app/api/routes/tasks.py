@@ -1,80 +1,558 @@
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta, timezone
 import uuid
 from typing import Any, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from fastapi import APIRouter, HTTPException, Query
-from sqlmodel import func, select
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Date, cast, tuple_
+from sqlmodel import Session, func, select
 
+from app import crud
+from app.api import archive, export, importer, rebalancer, sync
+from app.api.caching import conditional_get, conditional_get_version, expected_version, version_etag
 from app.api.deps import CurrentUser, SessionDep
-from app.models import Categories, Message, Task, TaskCreate, TaskPublic, TaskUpdate, TasksPublic
+from app.api.pagination import decode_created_at_cursor, decode_cursor, decode_sort_cursor, encode_cursor, resolve_count, seek_after
+from app.api.search import search_clauses, substring_filter
+from app.api.serialization import construct_all, json_response, parse_fields, public_columns, sparse_rows
+from app.core.config import settings
+from app.core.fractional_index import key_between
+from app.core.scheduler import reminders
+from app.models import Categories, ECountMode, EFileFormat, ESearchMode, ESortDirection, ETaskInclude, ETaskPriority, ETaskSort, ETaskStatus, BoardColumn, CalendarDay, CalendarTask, Message, NotePublic, Notes, NotesArchive, Task, TaskBoard, TaskCalendar, TaskChanges, TaskCreate, TaskImportJob, TaskImportJobPublic, TaskMove, TaskPublic, TaskTombstone, TaskUpdate, TasksPublic, UserCounters
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+TASK_INCLUDES = {include.value for include in ETaskInclude}
+
+# Longest range GET /tasks/calendar answers, a month view with its edges
+CALENDAR_MAX_DAYS = 42
+
+# How the sort value of a cursor is read back
+TASK_SORT_VALUES = {
+    ETaskSort.CREATED_AT: datetime.fromisoformat,
+    ETaskSort.UPDATED_AT: datetime.fromisoformat,
+    ETaskSort.DUE_DATE: datetime.fromisoformat,
+    ETaskSort.PRIORITY: ETaskPriority,
+}
+
+
+def _parse_includes(include: Optional[str]) -> set[ETaskInclude]:
+    try:
+        return {ETaskInclude(name.strip()) for name in (include or "").split(",") if name.strip()}
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"include must be a list of: {', '.join(sorted(TASK_INCLUDES))}")
+
+
+def _embedded_notes(
+    session: Session, task_ids: list[uuid.UUID], includes: set[ETaskInclude], archived: bool = False
+) -> dict[uuid.UUID, dict[str, Any]]:
+    """
+    Notes and/or note count of every task of a page, keyed by task id,
+    loaded in one task_id = ANY(...) query on ix_notes_task_id (and one on
+    ix_notes_archive_task_id when the page may hold archived tasks)
+    """
+    embedded: dict[uuid.UUID, dict[str, Any]] = {task_id: {} for task_id in task_ids}
+    if not includes or not task_ids:
+        return embedded
+    note_tables = (Notes, NotesArchive) if archived else (Notes,)
+    if ETaskInclude.NOTES in includes:
+        notes: dict[uuid.UUID, list[NotePublic]] = {task_id: [] for task_id in task_ids}
+        for note_table in note_tables:
+            rows = session.exec(
+                select(*public_columns(note_table, NotePublic)).where(crud.id_in(note_table.task_id, task_ids))
+            ).all()
+            for note in construct_all(NotePublic, rows):
+                notes[note.task_id].append(note)
+        for task_id, task_notes in notes.items():
+            embedded[task_id]["notes"] = task_notes
+            if ETaskInclude.NOTE_COUNT in includes:
+                embedded[task_id]["note_count"] = len(task_notes)
+    else:
+        counts: dict[uuid.UUID, int] = {}
+        for note_table in note_tables:
+            counts.update(session.exec(
+                select(note_table.task_id, func.count())
+                .where(crud.id_in(note_table.task_id, task_ids))
+                .group_by(note_table.task_id)
+            ).all())
+        for task_id in task_ids:
+            embedded[task_id]["note_count"] = counts.get(task_id, 0)
+    return embedded
+
+
 @router.get("/", response_model=TasksPublic)
 def get_tasks_by_owner(
     session: SessionDep, 
     current_user: CurrentUser, 
+    request: Request,
+    response: Response,
     skip: int = 0, 
-    limit: int = 100,
-    search: Optional[str] = None
+    limit: int = Query(default=100, ge=1),
+    search: Optional[str] = None,
+    search_mode: ESearchMode = ESearchMode.FULLTEXT,
+    cursor: Optional[str] = None,
+    count: ECountMode = ECountMode.CACHED,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    include_archived: bool = False,
+    sort: ETaskSort = ETaskSort.CREATED_AT,
+    direction: ESortDirection = ESortDirection.ASC,
 ) -> Any:
+    """
+    Retrieve tasks ordered by (sort, id), each order served by an
+    (owner_id, sort, id) index. Priority sorts High first ascending.
+    Pass the returned next_cursor as cursor to page with a keyset instead of
+    skip, so deep pages cost the same as the first one.
+    Full-text and fuzzy searches are ranked by relevance instead.
+    Answers 304 when If-None-Match holds the current ETag.
+    fields=id,title,... returns only those TaskPublic fields and selects
+    only their columns.
+    include=notes,note_count embeds the notes of the tasks of the page.
+    include_archived=true also returns the closed tasks moved to the archive.
+    """
+    after = decode_sort_cursor(cursor, sort.value, direction.value, TASK_SORT_VALUES[sort]) if cursor else None
+    selected = parse_fields(fields, TaskPublic)
+    includes = _parse_includes(include)
+    if selected is not None:
+        # notes and note_count aren't columns, they are loaded as includes
+        includes |= {ETaskInclude(name) for name in selected if name in TASK_INCLUDES}
+        selected = [name for name in selected if name not in TASK_INCLUDES]
+    # The archive is only read when asked for, the default stays on the hot table
+    source = archive.tasks_with_archive(current_user.id) if include_archived else Task.__table__
+    search_filter, search_rank = (
+        search_clauses(search, search_mode, (source.c.title, source.c.description), source.c.search_vector)
+        if search else (None, None)
+    )
+    if after and search_rank is not None:
+        raise HTTPException(status_code=400, detail="Cursor pagination is not supported with ranked search")
+    not_modified = conditional_get(session, request, response, current_user.id)
+    if not_modified:
+        return not_modified
     try:
         # Initialize the base filter condition
-        filter_condition = Task.owner_id == current_user.id
+        filter_condition = source.c.owner_id == current_user.id
 
         # Add search conditions if search is provided
-        if search:
-            search_filter = (
-                (Task.title.ilike(f"%{search}%")) | 
-                (Task.description.ilike(f"%{search}%"))
-                
-            )
+        if search_filter is not None:
             filter_condition = filter_condition & search_filter
 
-        # Query to get tasks along with category (if any)
-        statement = (
-            select(Task, Categories)  # Select both Task and Categories
-            .join(Categories, Task.categories_id == Categories.id, isouter=True)  # Outer join for tasks without categories
-            .where(filter_condition)
-            .offset(skip)
-            .limit(limit)
+        # Query the public task columns along with the category title (if any).
+        # A sparse fieldset still selects the cursor columns to page on.
+        columns = public_columns(
+            source, TaskPublic, None if selected is None else dict.fromkeys([*selected, sort.value, "id"])
         )
+        statement = select(*columns).select_from(source).where(filter_condition).limit(limit)
+        if selected is None or "category_title" in selected:
+            statement = statement.add_columns(
+                func.coalesce(Categories.title, "").label("category_title")
+            ).join(Categories, source.c.categories_id == Categories.id, isouter=True)  # Outer join for tasks without categories
+        if search_rank is not None:
+            statement = statement.order_by(search_rank.desc())
+        sort_column = source.c[sort.value]
+        descending = direction == ESortDirection.DESC
+        if descending:
+            statement = statement.order_by(sort_column.desc(), source.c.id.desc())
+        else:
+            statement = statement.order_by(sort_column, source.c.id)
+        if after:
+            # Seek past the previous page on the sort's index
+            statement = statement.where(seek_after(
+                sort_column, source.c.id, after, descending, nullable=sort == ETaskSort.DUE_DATE
+            ))
+        else:
+            statement = statement.offset(skip)
         results = session.exec(statement).all()
 
-        # Query to count total tasks
-        count_statement = select(func.count()).where(filter_condition).select_from(Task)
-        task_count = session.execute(count_statement).scalar_one()
-
-        # Map results to include tasks without categories
-        tasks = [
-            TaskPublic(
-                id=result.Task.id,
-                owner_id=result.Task.owner_id,
-                categories_id=result.Task.categories_id,
-                title=result.Task.title,
-                description=result.Task.description,
-                status=result.Task.status,
-                priority=result.Task.priority,
-                due_date=result.Task.due_date,
-                created_at=result.Task.created_at,
-                updated_at=result.Task.updated_at,
-                category_title=result.Categories.title if result.Categories else ""  # Check if Categories exists
-            )
-            for result in results
-        ]
+        # Query to count total tasks, the counters only cover the hot table
+        count_statement = select(func.count()).where(filter_condition).select_from(source)
+        task_count = resolve_count(
+            session, count, count_statement, current_user.id,
+            cached_column=UserCounters.task_total if search_filter is None and not include_archived else None,
+        )
 
-        return TasksPublic(data=tasks, count=task_count, task_count=task_count)
+        next_cursor = None
+        if len(results) == limit and search_rank is None:
+            last = results[-1]
+            next_cursor = encode_cursor(sort.value, direction.value, last._mapping[sort.value], last.id)
+
+        embedded = _embedded_notes(session, [row.id for row in results], includes, archived=include_archived)
+
+        if selected is not None:
+            data = [
+                {**sparse, **embedded[row.id]}
+                for row, sparse in zip(results, sparse_rows(results, selected))
+            ]
+            return json_response({"data": data, "count": task_count, "next_cursor": next_cursor}, response)
+        # Rows come straight from the database, skip validating them again
+        tasks = TasksPublic.model_construct(
+            data=[TaskPublic.model_construct(**row._mapping, **embedded[row.id]) for row in results],
+            count=task_count,
+            next_cursor=next_cursor,
+        )
+        return json_response(tasks, response)
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
 
+@router.get("/changes", response_model=TaskChanges)
+def get_task_changes(
+    session: SessionDep,
+    current_user: CurrentUser,
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
+) -> Any:
+    """
+    Tasks created or updated since the `since` token and the ids of the tasks
+    deleted since then, in (updated_at, id) order.
+    Without a token every task is returned. Call again with next_since right
+    away while has_more is true, then later on to pick up new changes.
+    """
+    position = sync.decode_sync_token(since) if since else None
+    watermark = sync.safe_watermark(session)
+    if position and position[0] < watermark - sync.TOMBSTONE_RETENTION:
+        raise HTTPException(status_code=410, detail="Sync token expired, reload the tasks")
+
+    filter_condition = (Task.owner_id == current_user.id) & (Task.updated_at < watermark)
+    if position:
+        changed_after, last_id = position
+        if last_id:
+            filter_condition = filter_condition & (tuple_(Task.updated_at, Task.id) > (changed_after, last_id))
+        else:
+            filter_condition = filter_condition & (Task.updated_at >= changed_after)
+
+    statement = (
+        select(*public_columns(Task, TaskPublic), func.coalesce(Categories.title, "").label("category_title"))
+        .select_from(Task)
+        .join(Categories, Task.categories_id == Categories.id, isouter=True)
+        .where(filter_condition)
+        .order_by(Task.updated_at, Task.id)
+        .limit(limit + 1)
+    )
+    results = session.exec(statement).all()
+    has_more = len(results) > limit
+    results = results[:limit]
+
+    if has_more:
+        last = results[-1]
+        batch_end = last.updated_at
+        next_since = sync.encode_sync_token(batch_end, last.id)
+    else:
+        batch_end = watermark
+        next_since = sync.encode_sync_token(watermark)
+
+    # Deletes are reported for the same time range as this batch of changes
+    deleted = []
+    if position:
+        deleted = session.exec(
+            select(TaskTombstone.task_id).where(
+                TaskTombstone.owner_id == current_user.id,
+                TaskTombstone.deleted_at >= position[0],
+                TaskTombstone.deleted_at < batch_end,
+            )
+        ).all()
+
+    changes = TaskChanges.model_construct(
+        data=construct_all(TaskPublic, results), deleted=deleted, next_since=next_since, has_more=has_more
+    )
+    return json_response(changes)
+
+@router.get("/export")
+def export_tasks(
+    current_user: CurrentUser,
+    export_format: EFileFormat = Query(EFileFormat.NDJSON, alias="format"),
+) -> StreamingResponse:
+    """
+    Stream all tasks of the current user as NDJSON or CSV
+    """
+    return StreamingResponse(
+        export.export_tasks(current_user.id, export_format),
+        media_type=export.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{export_format.value}"'},
+    )
+
+@router.post("/import", response_model=TaskImportJobPublic)
+def import_tasks(
+    session: SessionDep,
+    current_user: CurrentUser,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    file: UploadFile,
+    import_format: EFileFormat = Query(EFileFormat.NDJSON, alias="format"),
+) -> Any:
+    """
+    Bulk create tasks from an NDJSON or CSV file of TaskCreate rows.
+    Small files are imported right away, larger ones in the background:
+    the job is returned with a 202 and can be polled for progress.
+    """
+    job = TaskImportJob(owner_id=current_user.id, format=import_format)
+    session.add(job)
+    session.commit()
+
+    if file.size is not None and file.size <= settings.TASK_IMPORT_SYNC_MAX_BYTES:
+        importer.run_import(job.id, file.file)
+    else:
+        path = importer.spool_upload(file.file)
+        background_tasks.add_task(importer.run_import_file, job.id, path)
+        response.status_code = 202
+
+    session.refresh(job)
+    return job
+
+@router.get("/import/{job_id}", response_model=TaskImportJobPublic)
+def get_import_job(session: SessionDep, current_user: CurrentUser, job_id: uuid.UUID) -> Any:
+    """
+    Progress of a task import
+    """
+    job = session.get(TaskImportJob, job_id)
+    if not job or (not current_user.is_superuser and job.owner_id != current_user.id):
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+def _decode_board_cursor(cursor: str) -> tuple[ETaskStatus, Optional[str], uuid.UUID]:
+    payload = decode_cursor(cursor)
+    try:
+        status, position, task_id = payload
+        if position is not None and not isinstance(position, str):
+            raise ValueError(position)
+        return ETaskStatus(status), position, uuid.UUID(task_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _board_column(status: ETaskStatus, total: Optional[int], rows: list[Any], per_column: int) -> BoardColumn:
+    """
+    A column from up to per_column + 1 rows, the extra one only tells that
+    there is more to load
+    """
+    tasks = construct_all(TaskPublic, rows[:per_column])
+    next_cursor = None
+    if len(rows) > per_column:
+        last = tasks[-1]
+        next_cursor = encode_cursor(status.value, last.position, last.id)
+    return BoardColumn.model_construct(status=status, total=total, data=tasks, next_cursor=next_cursor)
+
+
+@router.get("/board", response_model=TaskBoard)
+def get_task_board(
+    session: SessionDep,
+    current_user: CurrentUser,
+    response: Response,
+    per_column: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+) -> Any:
+    """
+    The current user's tasks as a board of one column per status, each with
+    its first per_column tasks in their manual (position, id) order and its
+    total.
+    The whole board is one query: the tasks are ranked and counted per
+    status with window functions and only the ranked ones are sent back.
+    Pass a column's next_cursor as cursor to load more of that column, a
+    keyset page on ix_task_owner_id_status_position_id.
+    """
+    if cursor:
+        status, position, task_id = _decode_board_cursor(cursor)
+        rows = session.exec(
+            select(*public_columns(Task, TaskPublic), func.coalesce(Categories.title, "").label("category_title"))
+            .select_from(Task)
+            .join(Categories, Task.categories_id == Categories.id, isouter=True)
+            .where(
+                Task.owner_id == current_user.id,
+                Task.status == status,
+                seek_after(Task.position, Task.id, (position, task_id), nullable=True),
+            )
+            .order_by(Task.position, Task.id)
+            .limit(per_column + 1)
+        ).all()
+        board = TaskBoard.model_construct(columns=[_board_column(status, None, list(rows), per_column)])
+        return json_response(board, response)
+
+    ranked = (
+        select(
+            *public_columns(Task, TaskPublic),
+            func.row_number().over(partition_by=Task.status, order_by=(Task.position, Task.id)).label("rank"),
+            func.count().over(partition_by=Task.status).label("total"),
+        )
+        .where(Task.owner_id == current_user.id)
+        .subquery()
+    )
+    # Categories are only joined to the tasks that made it onto the board
+    rows = session.exec(
+        select(ranked, func.coalesce(Categories.title, "").label("category_title"))
+        .join(Categories, ranked.c.categories_id == Categories.id, isouter=True)
+        .where(ranked.c.rank <= per_column + 1)
+        .order_by(ranked.c.status, ranked.c.rank)
+    ).all()
+
+    by_status: dict[ETaskStatus, list[Any]] = {status: [] for status in ETaskStatus}
+    for row in rows:
+        by_status[row.status].append(row)
+    board = TaskBoard.model_construct(columns=[
+        _board_column(status, status_rows[0].total if status_rows else 0, status_rows, per_column)
+        for status, status_rows in by_status.items()
+    ])
+    return json_response(board, response)
+
+
+@router.get("/calendar", response_model=TaskCalendar)
+def get_task_calendar(
+    session: SessionDep,
+    current_user: CurrentUser,
+    response: Response,
+    from_: date = Query(alias="from"),
+    to: date = Query(),
+    tz: str = "UTC",
+    per_day: int = Query(default=3, ge=0, le=50),
+) -> Any:
+    """
+    The current user's tasks due between from and to (both included), by
+    day in the tz time zone: the totals per status and priority and the
+    first per_day tasks of every day with tasks due.
+    One query over ix_task_owner_id_due_date_id: the rows of the range are
+    bucketed with date_trunc and counted and ranked per day with window
+    functions, only the ranked ones are sent back.
+    """
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail="Unknown time zone")
+    if to < from_:
+        raise HTTPException(status_code=400, detail="to must not be before from")
+    if (to - from_).days >= CALENDAR_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"The range is limited to {CALENDAR_MAX_DAYS} days")
+    # due_date is a naive column holding UTC, compare it with naive UTC bounds
+    # so the filter doesn't depend on the session's TimeZone
+    start = datetime.combine(from_, time(), tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+    end = datetime.combine(to + timedelta(days=1), time(), tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+    # Read the naive value as UTC, then take the wall clock time in tz
+    day = cast(func.date_trunc("day", func.timezone(tz, func.timezone("UTC", Task.due_date))), Date)
+    per_day_window = {"partition_by": day}
+    by_status = {
+        status: func.count().filter(Task.status == status).over(**per_day_window).label(f"status_{status.name.lower()}")
+        for status in ETaskStatus
+    }
+    by_priority = {
+        priority: func.count().filter(Task.priority == priority).over(**per_day_window).label(f"priority_{priority.name.lower()}")
+        for priority in ETaskPriority
+    }
+    ranked = (
+        select(
+            Task.id, Task.title, Task.status, Task.priority, Task.due_date,
+            day.label("day"),
+            func.row_number().over(partition_by=day, order_by=(Task.due_date, Task.id)).label("rank"),
+            func.count().over(**per_day_window).label("total"),
+            *by_status.values(),
+            *by_priority.values(),
+        )
+        .where(Task.owner_id == current_user.id, Task.due_date >= start, Task.due_date < end)
+        .subquery()
+    )
+    # The first row of every day carries its counts even when per_day is 0
+    rows = session.exec(
+        select(ranked)
+        .where(ranked.c.rank <= max(per_day, 1))
+        .order_by(ranked.c.day, ranked.c.rank)
+    ).all()
+
+    days: dict[date, CalendarDay] = {}
+    for row in rows:
+        calendar_day = days.get(row.day)
+        if calendar_day is None:
+            calendar_day = days[row.day] = CalendarDay.model_construct(
+                day=row.day,
+                total=row.total,
+                by_status={status: row._mapping[column.name] for status, column in by_status.items()},
+                by_priority={priority: row._mapping[column.name] for priority, column in by_priority.items()},
+                tasks=[],
+            )
+        if row.rank <= per_day:
+            calendar_day.tasks.append(CalendarTask.model_construct(
+                id=row.id, title=row.title, status=row.status, priority=row.priority, due_date=row.due_date,
+            ))
+    return json_response(TaskCalendar.model_construct(data=list(days.values())), response)
+
+
+@router.get("/search", response_model=TasksPublic)
+def search_tasks(
+    session: SessionDep,
+    current_user: CurrentUser,
+    response: Response,
+    title: Optional[str] = None,
+    category_title: Optional[str] = None,
+    status: Optional[ETaskStatus] = None,
+    priority: Optional[ETaskPriority] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    count: ECountMode = ECountMode.EXACT,
+) -> Any:
+    """
+    Search the current user's tasks, any filter can be combined with the
+    others. title and category_title match anywhere in the text, ignoring
+    case, on their trigram indexes. The due_date range includes both days.
+    Ordered by (created_at, id) and paged with next_cursor like GET /tasks/.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    after = decode_created_at_cursor(cursor) if cursor else None
+
+    # Owner first, so status/priority and due_date filters are served by
+    # ix_task_owner_id_status_priority and ix_task_owner_id_due_date_id
+    filters = [Task.owner_id == current_user.id]
+    if status:
+        filters.append(Task.status == status)
+    if priority:
+        filters.append(Task.priority == priority)
+    if start_date:
+        filters.append(Task.due_date >= start_date)
+    if end_date:
+        filters.append(Task.due_date < end_date + timedelta(days=1))
+    if title:
+        filters.append(substring_filter([Task.title], title))
+    if category_title:
+        filters.append(substring_filter([Categories.title], category_title))
+
+    statement = (
+        select(*public_columns(Task, TaskPublic), func.coalesce(Categories.title, "").label("category_title"))
+        .select_from(Task)
+        .join(Categories, Task.categories_id == Categories.id, isouter=True)  # Keep tasks without category
+        .where(*filters)
+        .order_by(Task.created_at, Task.id)
+        .limit(limit)
+    )
+    if after:
+        statement = statement.where(tuple_(Task.created_at, Task.id) > after)
+    results = session.exec(statement).all()
+
+    count_statement = (
+        select(func.count())
+        .select_from(Task)
+        .join(Categories, Task.categories_id == Categories.id, isouter=True)
+        .where(*filters)
+    )
+    task_count = resolve_count(session, count, count_statement, current_user.id)
+
+    next_cursor = None
+    if len(results) == limit:
+        last = results[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    tasks = TasksPublic.model_construct(
+        data=construct_all(TaskPublic, results), count=task_count, next_cursor=next_cursor
+    )
+    return json_response(tasks, response)
+
 @router.get("/{task_id}", response_model=TaskPublic)
-def get_task(session: SessionDep, current_user: CurrentUser, task_id: uuid.UUID ):
+def get_task(session: SessionDep, current_user: CurrentUser, request: Request, response: Response, task_id: uuid.UUID ):
     task = session.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     if not current_user.is_superuser and task.owner_id != current_user.id:
             raise HTTPException(status_code=400, detail="Not enough permissions")
+    # Tagged with its version, send it back as If-Match to update the task
+    not_modified = conditional_get_version(request, response, task.version)
+    if not_modified:
+        return not_modified
     return task
 
 @router.post("/", response_model=TaskPublic)
@@ -84,6 +562,7 @@ def create_task(
     task: TaskCreate, 
 ): 
     try: 
+        category = None
         if task.categories_id:
             category = session.get(Categories, task.categories_id)
             if not category:
@@ -91,46 +570,180 @@ def create_task(
             if not current_user.is_superuser and category.owner_id != current_user.id:
                 raise HTTPException(status_code=400, detail="Not enough permissions")
         
-        task_data = task.dict()
-
-        task_data["categories_id"] = task.categories_id
-        # task_data["categories_id"] = categories_id if task.categories_id == "" else task.categories_id
-
-        new_task = Task(
-            **task_data,
-            owner_id=current_user.id,
-        )
+        task_data = task.model_dump()
+        task_data["id"] = uuid.uuid4()
+        task_data["owner_id"] = current_user.id
+        # New tasks go to the end of their board column
+        task_data["position"] = key_between(_edge_position(session, current_user.id, task.status), None)
 
-        session.add(new_task)
+        row = crud.create_task(session=session, task_data=task_data)
         session.commit()
-        session.refresh(new_task)
-        return new_task
+        reminders.schedule(row.id, row.due_date)
+        return TaskPublic.model_validate(
+            {**row._mapping, "category_title": category.title if category else ""}
+        )
+    except HTTPException:
+        session.rollback()
+        raise
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
 
 @router.put('/{task_id}', response_model=TaskPublic)
-def update_task(*, session: SessionDep, current_user: CurrentUser, task_id: uuid.UUID,task_update: TaskUpdate, categories_id: Optional[uuid.UUID] = None,):
-    task = session.get(Task, task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    for key, value in task_update.dict(exclude_unset=True).items():
-        setattr(task, key, value)
-
+def update_task(*, session: SessionDep, current_user: CurrentUser, request: Request, response: Response, task_id: uuid.UUID,task_update: TaskUpdate, categories_id: Optional[uuid.UUID] = None,):
+    """
+    Update a task. With If-Match (or version in the body) the update only
+    applies if the task is still at that version, else 409.
+    """
+    values = task_update.model_dump(exclude_unset=True)
+    version = expected_version(request, values.pop("version", None))
     if categories_id:
-        category = session.get(Categories, categories_id)
-        if not category:
-            raise HTTPException(status_code=404, detail="Category not found")
-        if not current_user.is_superuser and task.owner_id != current_user.id:
+        values["categories_id"] = categories_id
+
+    # Fast path: a single owner-scoped compare-and-swap UPDATE ... RETURNING
+    owner_id = None if current_user.is_superuser else current_user.id
+    row = crud.update_task(
+        session=session, task_id=task_id, owner_id=owner_id, values=values, expected_version=version
+    )
+    if row is None:
+        session.rollback()
+        # Nothing matched, find out why
+        task = session.get(Task, task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        if owner_id is not None and task.owner_id != owner_id:
             raise HTTPException(status_code=400, detail="Not enough permissions")
-        task.categories_id = categories_id
+        if version is not None and task.version != version:
+            raise HTTPException(status_code=409, detail="Task was modified, reload it and retry")
+        if values.get("categories_id") is not None:
+            category = session.get(Categories, values["categories_id"])
+            if not category:
+                raise HTTPException(status_code=404, detail="Category not found")
+            if owner_id is not None and category.owner_id != owner_id:
+                raise HTTPException(status_code=400, detail="Not enough permissions")
+        # The task changed in between (e.g. deleted concurrently)
+        raise HTTPException(status_code=409, detail="Task was modified, reload it and retry")
 
-    task.updated_at = datetime.utcnow()
-    session.add(task)
     session.commit()
-    session.refresh(task)
-    return task
+    reminders.schedule(row.id, row.due_date)
+    response.headers["ETag"] = version_etag(row.version)
+    return TaskPublic.model_validate(row._mapping)
+
+def _edge_position(
+    session: Session,
+    owner_id: uuid.UUID,
+    status: ETaskStatus,
+    bound: Optional[str] = None,
+    after: bool = False,
+    exclude_id: Optional[uuid.UUID] = None,
+) -> Optional[str]:
+    """
+    Key of the column's task closest to bound: the first one after it when
+    after is set, else the last one before it (or the last one of the column
+    without bound). One row off ix_task_owner_id_status_position_id.
+    """
+    statement = select(Task.position).where(
+        Task.owner_id == owner_id, Task.status == status, Task.position.is_not(None)
+    )
+    if exclude_id is not None:
+        statement = statement.where(Task.id != exclude_id)
+    if after:
+        statement = statement.where(Task.position > bound).order_by(Task.position)
+    else:
+        if bound is not None:
+            statement = statement.where(Task.position < bound)
+        statement = statement.order_by(Task.position.desc())
+    return session.exec(statement.limit(1)).first()
+
+
+def _neighbour_position(
+    session: Session, owner_id: uuid.UUID, status: ETaskStatus, neighbour_id: uuid.UUID
+) -> str:
+    # Locked, so a rebalance of the column can't respace it under the move
+    neighbour = session.exec(
+        select(Task.status, Task.position)
+        .where(Task.id == neighbour_id, Task.owner_id == owner_id)
+        .with_for_update()
+    ).first()
+    if neighbour is None:
+        raise HTTPException(status_code=404, detail="Neighbour task not found")
+    if neighbour.status != status:
+        raise HTTPException(status_code=400, detail="Neighbour task is in another column")
+    return neighbour.position
+
+
+def _move_position(session: Session, task: Task, status: ETaskStatus, move: TaskMove) -> str:
+    """
+    A key between the requested neighbours, from their current keys
+    """
+    after = _neighbour_position(session, task.owner_id, status, move.after_id) if move.after_id else None
+    before = _neighbour_position(session, task.owner_id, status, move.before_id) if move.before_id else None
+    if move.after_id and not move.before_id:
+        before = _edge_position(session, task.owner_id, status, after, after=True, exclude_id=task.id)
+    elif move.before_id and not move.after_id:
+        after = _edge_position(session, task.owner_id, status, before, exclude_id=task.id)
+    elif not move.after_id:
+        after = _edge_position(session, task.owner_id, status, exclude_id=task.id)
+    return key_between(after, before)
+
+
+@router.post("/{task_id}/move", response_model=TaskPublic)
+def move_task(
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    request: Request,
+    response: Response,
+    task_id: uuid.UUID,
+    move: TaskMove,
+) -> Any:
+    """
+    Drop a task between two tasks of a board column, changing its status
+    when moved to another column. Only the moved task is written, it gets a
+    fractional key between its neighbours' keys.
+    """
+    if task_id in (move.after_id, move.before_id):
+        raise HTTPException(status_code=400, detail="A task can't be its own neighbour")
+    version = expected_version(request, move.version)
+    task = session.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not current_user.is_superuser and task.owner_id != current_user.id:
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    status = move.status or task.status
+
+    unplaced = session.exec(
+        select(Task.id).where(Task.owner_id == task.owner_id, Task.status == status, Task.position.is_(None)).limit(1)
+    ).first()
+    if unplaced is not None:
+        # Place the whole column first, a key can't be computed next to NULL
+        rebalancer.rebalance_column(session, task.owner_id, status)
+    try:
+        position = _move_position(session, task, status, move)
+    except ValueError:
+        # Neighbours out of order or sharing a key (two drops into the same
+        # gap at once): respace the column and try again
+        rebalancer.rebalance_column(session, task.owner_id, status)
+        try:
+            position = _move_position(session, task, status, move)
+        except ValueError:
+            session.rollback()
+            raise HTTPException(status_code=409, detail="after_id must come before before_id")
+
+    row = crud.update_task(
+        session=session,
+        task_id=task_id,
+        owner_id=task.owner_id,
+        values={"status": status, "position": position},
+        expected_version=version,
+    )
+    if row is None:
+        session.rollback()
+        raise HTTPException(status_code=409, detail="Task was modified, reload it and retry")
+    session.commit()
+    response.headers["ETag"] = version_etag(row.version)
+    return TaskPublic.model_validate(row._mapping)
+
 
 @router.delete("/{task_id}", response_model=dict)
 def delete_task(task_id: uuid.UUID, current_user: CurrentUser, session: SessionDep):
@@ -141,6 +754,7 @@ def delete_task(task_id: uuid.UUID, current_user: CurrentUser, session: SessionD
         raise HTTPException(status_code=400, detail="Not enough permissions")
     session.delete(task)
     session.commit()
+    reminders.cancel(task_id)
     return {"detail": "Task deleted successfully"}
 
 @router.patch("/status", response_model=dict)
@@ -148,57 +762,61 @@ def update_tasks_status(
     session: SessionDep,
     current_user: CurrentUser,
     task_ids: List[uuid.UUID] = Query(...),
-    status: str = Query(...),
+    status: ETaskStatus = Query(...),
 ):
     """
     Update the status of multiple tasks
     """
-    # Fetch tasks matching the provided IDs
-    tasks = session.exec(select(Task).where(Task.id.in_(task_ids))).all()
-
-    if not tasks:
+    # One owner-scoped UPDATE ... RETURNING id instead of loading every task
+    owner_id = None if current_user.is_superuser else current_user.id
+    updated = crud.update_tasks_status(
+        session=session, task_ids=task_ids, status=status, owner_id=owner_id
+    )
+
+    forbidden, missing = crud.partition_skipped_ids(
+        session=session, model=Task, requested=task_ids, affected=updated, owner_id=owner_id
+    )
+    if forbidden:
+        session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Not enough permissions to update tasks {', '.join(str(task_id) for task_id in forbidden)}",
+        )
+    if not updated:
+        session.rollback()
         raise HTTPException(status_code=404, detail="No tasks found")
 
-    # Check permissions for each task
-    for task in tasks:
-        if not current_user.is_superuser and task.owner_id != current_user.id:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Not enough permissions to update task {task.id}",
-            )
-
-    # Update the status of tasks
-    for task in tasks:
-        task.status = status
-        task.updated_at = datetime.utcnow()
-        session.add(task)
-
     session.commit()
-    return {"detail": f"{len(tasks)} tasks updated successfully"}
+    return {
+        "detail": f"{len(updated)} tasks updated successfully",
+        "updated": updated,
+        "missing": missing,
+    }
 
 
 @router.delete("/", response_model=dict)
 def delete_tasks(task_ids: List[uuid.UUID], session: SessionDep, current_user: CurrentUser):
-    # Fetch tasks using the task_ids
-    tasks = session.exec(select(Task).where(Task.id.in_(task_ids))).all()
+    # One owner-scoped DELETE ... RETURNING id, notes go with the cascade
+    owner_id = None if current_user.is_superuser else current_user.id
+    deleted = crud.delete_owned(session=session, model=Task, owner_id=owner_id, ids=task_ids)
+
+    # Check permissions: if user is not superuser and not the owner of the task, raise error
+    forbidden, missing = crud.partition_skipped_ids(
+        session=session, model=Task, requested=task_ids, affected=deleted, owner_id=owner_id
+    )
+    if forbidden:
+        session.rollback()
+        raise HTTPException(status_code=400, detail="Not enough permissions")
 
     # If no tasks are found, raise a 404 error
-    if not tasks:
+    if not deleted:
+        session.rollback()
         raise HTTPException(status_code=404, detail="No tasks found")
 
-    # Check permissions: if user is not superuser and not the owner of the task, raise error
-    for task in tasks:
-        if not current_user.is_superuser and task.owner_id != current_user.id:
-            raise HTTPException(status_code=400, detail="Not enough permissions")
-    
-    # If permission is valid, delete each task
-    for task in tasks:
-        session.delete(task)
-
     # Commit the changes to the database
     session.commit()
 
-    return {"detail": f"{len(tasks)} tasks deleted successfully"}
+    return {"detail": f"{len(deleted)} tasks deleted successfully", "deleted": deleted, "missing": missing}
 
 
 @router.delete("/{task_id}/categories", response_model=dict)
@@ -250,111 +868,3 @@ def remove_category_from_task(task_id: uuid.UUID, session: SessionDep, current_u
     session.refresh(task)
 
     return {"detail": "Category removed from task successfully"}
-
-
-# ===================
-# fix search
-# ===================
-
-# @router.get("/search", response_model=List[TasksPublic])
-# def search_tasks(
-#     session: SessionDep, 
-#     title: Optional[str] = Query(None),
-#     category_title: Optional[str] = Query(None),
-#     status: Optional[str] = Query(None),
-#     priority: Optional[str] = Query(None),
-#     start_date: Optional[date] = Query(None),
-#     end_date: Optional[date] = Query(None),
-#     categories_id: Optional[uuid.UUID] = None,
-#     current_user: CurrentUser,
-# ):
-#     try :
-#         query = session.query(Task).join(Categories, Task.categories_id == categories_id)
-
-#         # Tìm kiếm theo tiêu đề task hoặc category
-#         if title:
-#             query = query.filter(func.lower(Task.title).contains(title.lower()))
-#         if category_title:
-#             query = query.filter(func.lower(Categories.title).contains(category_title.lower()))
-
-#         # Lọc theo trạng thái
-#         if status:
-#             query = query.filter(Task.status == status)
-
-#         # Lọc theo độ ưu tiên
-#         if priority:
-#             query = query.filter(Task.priority == priority)
-
-#         # Lọc theo ngày hạn chót
-#         if start_date and end_date:
-#             query = query.filter(Task.due_date.between(start_date, end_date))
-#         elif start_date:
-#             query = query.filter(Task.due_date >= start_date)
-#         elif end_date:
-#             query = query.filter(Task.due_date <= end_date)
-
-#         # Thực thi truy vấn
-#         tasks = query.all()
-#         if not tasks:
-#             raise HTTPException(status_code=404, detail="No tasks found matching the criteria")
-#         if not current_user.is_superuser and tasks.owner_id != current_user.id:
-#             raise HTTPException(status_code=400, detail="Not enough permissions")
-#         return tasks
-#     except Exception as e:
-#         session.rollback()
-#         raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
-
-@router.get("/search", response_model=List[TasksPublic])
-def search_tasks(
-    session: SessionDep, 
-    current_user: CurrentUser,
-    title: Optional[str] = Query(None),
-    category_title: Optional[str] = Query(None),
-    status: Optional[str] = Query(None),
-    priority: Optional[str] = Query(None),
-    start_date: Optional[date] = Query(None),
-    end_date: Optional[date] = Query(None),
-):
-    try:
-        query = session.query(Task).join(Categories, Task.categories_id == Categories.id)
-
-        if title:
-            query = query.filter(func.lower(Task.title).contains(title.lower()))
-        if category_title:
-            query = query.filter(func.lower(Categories.title).contains(category_title.lower()))
-
-        if status:
-            query = query.filter(Task.status == status)
-
-        if priority:
-            query = query.filter(Task.priority == priority)
-
-        if start_date and end_date:
-            query = query.filter(Task.due_date.between(start_date, end_date))
-        elif start_date:
-            query = query.filter(Task.due_date >= start_date)
-        elif end_date:
-            query = query.filter(Task.due_date <= end_date)
-
-        # if categories_id:
-        #     query = query.filter(Task.categories_id == categories_id)
-
-        tasks = query.all()
-
-        if not tasks:
-            raise HTTPException(status_code=404, detail="No tasks found matching the criteria")
-        # if not current_user.is_superuser:
-        #     # tasks = [task for task in tasks if task. == current_user.id]
-        #     if not tasks:
-        #         raise HTTPException(status_code=403, detail="Not enough permissions to access these tasks")
-        # if not current_user.is_superuser:
-        #         raise HTTPException(status_code=400, detail="Not enough permissions")
-            
-        for task in tasks:
-            if not current_user.is_superuser:
-                raise HTTPException(status_code=400, detail="Not enough permissions")
-        return tasks
-
-    except Exception as e:
-        session.rollback()
-        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
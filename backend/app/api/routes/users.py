@@ -10,6 +10,7 @@ from app.api.deps import (
     SessionDep,
     get_current_active_superuser,
 )
+from app.api.serialization import construct_all, json_response, public_columns
 from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
 from app.models import (
@@ -42,10 +43,10 @@ def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
     count_statement = select(func.count()).select_from(User)
     count = session.exec(count_statement).one()
 
-    statement = select(User).offset(skip).limit(limit)
+    statement = select(*public_columns(User, UserPublic)).offset(skip).limit(limit)
     users = session.exec(statement).all()
 
-    return UsersPublic(data=users, count=count)
+    return json_response(UsersPublic.model_construct(data=construct_all(UserPublic, users), count=count))
 
 
 @router.post(
@@ -0,0 +1,99 @@
+import re
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import String, func, literal, or_
+
+from app.models import ESearchMode
+
+# Vietnamese has no stemmer in Postgres, so text is indexed with the
+# language-neutral "simple" configuration (lowercase, no stop words)
+TEXT_SEARCH_CONFIG = "simple"
+
+_WORD = re.compile(r"\w+")
+
+
+def to_prefix_tsquery(search: str) -> Any | None:
+    """
+    Turn free text into a tsquery where every word is matched as a prefix.
+    Returns None when the text has no searchable words.
+    """
+    words = _WORD.findall(search)
+    if not words:
+        return None
+    query = " & ".join(f"{word}:*" for word in words)
+    return func.to_tsquery(TEXT_SEARCH_CONFIG, query)
+
+
+def fulltext_filter(vector: Any, tsquery: Any) -> Any:
+    """
+    Match a tsvector column, served by its GIN index
+    """
+    return vector.bool_op("@@")(tsquery)
+
+
+def fulltext_rank(vector: Any, tsquery: Any) -> Any:
+    return func.ts_rank(vector, tsquery)
+
+
+def escape_like(search: str) -> str:
+    return search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def substring_filter(columns: Sequence[Any], search: str) -> Any:
+    """
+    Case-insensitive infix match on any of the columns.
+    Served by their pg_trgm GIN indexes once the term has 3+ characters.
+    """
+    pattern = f"%{escape_like(search)}%"
+    return or_(*(column.ilike(pattern, escape="\\") for column in columns))
+
+
+def fold(expression: Any) -> Any:
+    """
+    Lowercase and strip diacritics, matching the f_unaccent(lower(column))
+    expression indexes so folded search is as cheap as a plain substring search
+    """
+    return func.f_unaccent(func.lower(expression), type_=String)
+
+
+def unaccent_filter(columns: Sequence[Any], search: str) -> Any:
+    pattern = literal("%") + fold(escape_like(search)) + literal("%")
+    return or_(*(fold(column).like(pattern, escape="\\") for column in columns))
+
+
+def fuzzy_filter(columns: Sequence[Any], search: str) -> Any:
+    """
+    Trigram similarity match (pg_trgm % operator) on any of the columns
+    """
+    return or_(*(column.bool_op("%")(search) for column in columns))
+
+
+def fuzzy_rank(columns: Sequence[Any], search: str) -> Any:
+    return func.greatest(*(func.similarity(column, search) for column in columns))
+
+
+def search_clauses(
+    search: str,
+    search_mode: ESearchMode,
+    columns: Sequence[Any],
+    vector: Any | None = None,
+) -> tuple[Any | None, Any | None]:
+    """
+    Build the (filter, rank) pair for a search over the given text columns.
+    rank is None when the mode keeps the natural ordering of the list.
+    """
+    if search_mode == ESearchMode.FULLTEXT:
+        if vector is None:
+            raise HTTPException(status_code=400, detail="Full-text search is only available for tasks")
+        tsquery = to_prefix_tsquery(search)
+        if tsquery is None:
+            # No words to index on (e.g. "!!!"): match the text as typed
+            return substring_filter(columns, search), None
+        return fulltext_filter(vector, tsquery), fulltext_rank(vector, tsquery)
+    if search_mode == ESearchMode.FUZZY:
+        return fuzzy_filter(columns, search), fuzzy_rank(columns, search)
+    if search_mode == ESearchMode.UNACCENT:
+        return unaccent_filter(columns, search), None
+    return substring_filter(columns, search), None
@@ -0,0 +1,67 @@
+from collections.abc import Iterable
+from typing import Any, TypeVar
+
+import pydantic_core
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy import Row
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def public_columns(
+    table_model: Any, public_model: type[BaseModel], fields: Iterable[str] | None = None
+) -> list[Any]:
+    """
+    Columns of table_model that public_model exposes, e.g. to select users
+    without their hashed_password. fields narrows them down further.
+    table_model may also be a subquery with the table's columns.
+    """
+    table = getattr(table_model, "__table__", table_model)
+    names = public_model.model_fields if fields is None else fields
+    return [table.c[name] for name in names if name in table.c]
+
+
+def parse_fields(fields: str | None, public_model: type[BaseModel]) -> list[str] | None:
+    """
+    Validate a comma separated ?fields= list against the public model.
+    Returns None when every field is wanted.
+    """
+    if not fields:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in public_model.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return names or None
+
+
+def sparse_rows(rows: Iterable[Row[Any]], fields: list[str]) -> list[dict[str, Any]]:
+    """
+    Only the requested fields of each row, the others may have been selected
+    for ordering or paging
+    """
+    return [{name: row._mapping[name] for name in fields} for row in rows]
+
+
+def construct_all(public_model: type[ModelT], rows: Iterable[Row[Any]]) -> list[ModelT]:
+    """
+    Build public models from rows of public_columns without validating them.
+    Only for data read back from the database, which the constraints already
+    hold to the model's types.
+    """
+    return [public_model.model_construct(**row._mapping) for row in rows]
+
+
+def json_response(content: BaseModel | dict[str, Any], response: Response | None = None) -> Response:
+    """
+    Serialize a model, or a plain dict of a sparse fieldset, to JSON bytes
+    with the compiled pydantic serializer.
+    FastAPI passes a returned Response through untouched, so the payload is
+    not validated a second time against the route's response_model, which is
+    then only used for the OpenAPI schema. Headers already set on the route's
+    Response parameter are carried over.
+    """
+    body = pydantic_core.to_json(content)
+    headers = dict(response.headers) if response is not None else None
+    return Response(content=body, media_type="application/json", headers=headers)
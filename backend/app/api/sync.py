@@ -0,0 +1,59 @@
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.api.pagination import decode_cursor, encode_cursor
+from app.core.config import settings
+from app.core.timestamps import naive_utc
+
+# Tombstones older than this are pruned (see migration 882faf6f1ac5), a sync
+# token from before it can't tell about every delete anymore
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+# updated_at is the start time of the writing transaction, which may commit
+# after a reader already moved past that time. Only hand out watermarks older
+# than every open transaction of this database that has written something
+# (has an xid): read-only ones, like a streaming export, can't land a change.
+# A transaction is only counted from its first write on, the app's writes
+# follow their reads within the same short request.
+# The watermark never lags now() by more than SYNC_WATERMARK_MAX_LAG_SECONDS,
+# so one long transaction can't freeze every client's sync; changes it
+# commits after that long may be missed by clients that synced meanwhile.
+SAFE_WATERMARK = text(
+    """
+    SELECT greatest(least(now(), min(xact_start)), now() - make_interval(secs => :max_lag)) AT TIME ZONE 'UTC'
+    FROM pg_stat_activity
+    WHERE datname = current_database()
+      AND backend_type = 'client backend'
+      AND pid <> pg_backend_pid()
+      AND state <> 'idle'
+      AND backend_xid IS NOT NULL
+    """
+)
+
+
+def safe_watermark(session: Session) -> datetime:
+    """
+    Naive UTC like updated_at, which it is compared with
+    """
+    return session.execute(SAFE_WATERMARK, {"max_lag": settings.SYNC_WATERMARK_MAX_LAG_SECONDS}).scalar_one()
+
+
+def encode_sync_token(changed_at: datetime, task_id: uuid.UUID | None = None) -> str:
+    """
+    task_id is set when the token points inside a batch of changes, None
+    when it is the watermark the client is fully synced up to
+    """
+    return encode_cursor(naive_utc(changed_at), task_id)
+
+
+def decode_sync_token(token: str) -> tuple[datetime, uuid.UUID | None]:
+    payload = decode_cursor(token)
+    try:
+        changed_at, task_id = payload
+        return naive_utc(datetime.fromisoformat(changed_at)), uuid.UUID(task_id) if task_id else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
@@ -86,6 +86,31 @@ class Settings(BaseSettings):
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
 
+    # Task imports larger than this run as a background job
+    TASK_IMPORT_SYNC_MAX_BYTES: int = 1024 * 1024
+    # How far the /tasks/changes watermark may lag behind now() while a
+    # long transaction writing tasks is open
+    SYNC_WATERMARK_MAX_LAG_SECONDS: int = 300
+
+    # Start the background loops (overdue scanner, ...) with the app
+    BACKGROUND_WORKERS_ENABLED: bool = True
+    OVERDUE_SCAN_INTERVAL_SECONDS: int = 60
+    OVERDUE_SCAN_BATCH_SIZE: int = 500
+    # Reminders are sent this long before a task's due_date
+    TASK_REMINDER_LEAD_MINUTES: int = 30
+    # How far ahead the reminder scheduler keeps deadlines in memory
+    TASK_REMINDER_HORIZON_MINUTES: int = 60
+    # Completed/cancelled tasks untouched for this long move to the archive
+    ARCHIVE_AFTER_DAYS: int = 90
+    ARCHIVE_INTERVAL_SECONDS: int = 3600
+    ARCHIVE_BATCH_SIZE: int = 500
+    # Pause between two archive batches, to leave I/O to the requests
+    ARCHIVE_BATCH_PAUSE_SECONDS: float = 0.5
+    # Board columns with unplaced tasks or too long position keys are
+    # respaced by the rebalancer, this many per pass
+    POSITION_REBALANCE_INTERVAL_SECONDS: int = 300
+    POSITION_REBALANCE_BATCH_SIZE: int = 100
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def emails_enabled(self) -> bool:
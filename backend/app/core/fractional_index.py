@@ -0,0 +1,71 @@
+"""
+Fractional indexing: order keys that always leave room for another key in
+between, so moving an item only rewrites the item's own key.
+
+Keys are base 62 fractions (0.xyz...) written without the "0.", compared
+as plain strings. Their digits are in ASCII order, so the database must
+compare them byte by byte (COLLATE "C"). A key never ends with the zero
+digit, otherwise nothing would fit right before it ("a" < "a0" < ?).
+"""
+from collections.abc import Iterator
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+_VALUES = {digit: value for value, digit in enumerate(DIGITS)}
+
+
+def validate_key(key: str) -> None:
+    if not key or key[-1] == DIGITS[0] or any(digit not in _VALUES for digit in key):
+        raise ValueError(f"Invalid order key: {key!r}")
+
+
+def _midpoint(a: str, b: str | None) -> str:
+    """
+    Digits strictly between 0.a and 0.b (1 when b is None), a < b
+    """
+    if b is not None:
+        # Keep the common prefix, a is padded with zeros
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = _VALUES[a[0]] if a else 0
+    digit_b = _VALUES[b[0]] if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    # Adjacent first digits
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def key_between(a: str | None, b: str | None) -> str:
+    """
+    A key sorting after a and before b, None being the start and the end.
+    Raises ValueError unless a < b.
+    """
+    for key in (a, b):
+        if key is not None:
+            validate_key(key)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"{a!r} does not sort before {b!r}")
+    return _midpoint(a or "", b)
+
+
+def spread_keys(count: int) -> Iterator[str]:
+    """
+    count ascending keys, evenly spaced and of the shortest length that
+    still leaves about BASE free keys between two neighbours
+    """
+    length = 1
+    while BASE**length < (count + 1) * BASE:
+        length += 1
+    step = BASE**length // (count + 1)
+    for i in range(1, count + 1):
+        value = i * step
+        digits = []
+        for _ in range(length):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        yield "".join(reversed(digits)).rstrip(DIGITS[0])
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import psycopg
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel of the task triggers (see migration 6fad4a65abae)
+CHANNEL = "task_events"
+# Events buffered per connection before the client is told to resync
+QUEUE_SIZE = 100
+RECONNECT_DELAY_SECONDS = 5
+# Larger batches are sent without their ids to stay under the NOTIFY payload
+# limit, clients then reload like on a resync
+MAX_EVENT_IDS = 100
+
+# Sent instead of events a client missed: a queue overflow or a lost LISTEN
+# connection. The client should reload, e.g. through GET /tasks/changes.
+RESYNC_EVENT: dict[str, Any] = {"type": "resync"}
+
+
+def _offer(queue: "asyncio.Queue[dict[str, Any]]", event: dict[str, Any]) -> None:
+    if queue.full():
+        while not queue.empty():
+            queue.get_nowait()
+        event = RESYNC_EVENT
+    queue.put_nowait(event)
+
+
+class RealtimeHub:
+    """
+    Fans the task events of the worker's single LISTEN connection out to the
+    WebSocket/SSE connections of each user. An idle connection is just a
+    queue here, it costs no database query.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[uuid.UUID, set[asyncio.Queue[dict[str, Any]]]] = defaultdict(set)
+
+    @contextmanager
+    def subscribe(self, user_id: uuid.UUID) -> Iterator["asyncio.Queue[dict[str, Any]]"]:
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers[user_id].add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers[user_id]
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def dispatch(self, event: dict[str, Any]) -> None:
+        try:
+            owner_id = uuid.UUID(event["owner_id"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Dropping realtime event without owner: %r", event)
+            return
+        for queue in self._subscribers.get(owner_id, ()):
+            _offer(queue, event)
+
+    def broadcast(self, event: dict[str, Any]) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                _offer(queue, event)
+
+    async def listen(self) -> None:
+        """
+        Forward the notifications of CHANNEL to the subscribers until
+        cancelled, reconnecting after a delay on any error
+        """
+        conninfo = str(settings.SQLALCHEMY_DATABASE_URI).replace("postgresql+psycopg://", "postgresql://", 1)
+        reconnecting = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as connection:
+                    await connection.execute(f"LISTEN {CHANNEL}")
+                    if reconnecting:
+                        self.broadcast(RESYNC_EVENT)
+                    async for notify in connection.notifies():
+                        try:
+                            self.dispatch(json.loads(notify.payload))
+                        except ValueError:
+                            logger.warning("Dropping malformed realtime event: %r", notify.payload)
+            except Exception:
+                # Connection lost, or anything else: never let the listener die
+                logger.exception("Realtime LISTEN connection lost")
+            reconnecting = True
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+
+hub = RealtimeHub()
+
+
+def task_event(event_type: str, owner_id: uuid.UUID, task_ids: Iterable[uuid.UUID]) -> dict[str, Any]:
+    """
+    Same shape as the events of the task triggers
+    """
+    ids = [str(task_id) for task_id in task_ids]
+    return {
+        "type": event_type,
+        "owner_id": str(owner_id),
+        "count": len(ids),
+        "ids": ids if len(ids) <= MAX_EVENT_IDS else None,
+    }
+
+
+def publish(session: Session, events: Iterable[dict[str, Any]]) -> None:
+    """
+    Send events to every worker's hub. Postgres delivers them when the
+    session's transaction commits, and drops them if it rolls back.
+    """
+    for event in events:
+        session.execute(select(func.pg_notify(CHANNEL, json.dumps(event))))
@@ -0,0 +1,170 @@
+import asyncio
+import heapq
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import tuple_, update
+from sqlmodel import Session, select
+
+from app.core import realtime
+from app.core.config import settings
+from app.core.db import engine
+from app.core.timestamps import naive_utc, utc_now
+from app.models import ETaskStatus, Task
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = (ETaskStatus.COMPLETED, ETaskStatus.CANCELLED)
+
+
+def _open_unreminded() -> list:
+    return [
+        Task.due_date.is_not(None),
+        Task.reminder_sent_at.is_(None),
+        Task.status.not_in(CLOSED_STATUSES),
+    ]
+
+
+def load_upcoming(until: datetime) -> list[tuple[uuid.UUID, datetime]]:
+    """
+    (id, due_date) of the open tasks whose reminder is due before until,
+    a range scan of ix_task_reminder_due_date
+    """
+    lead = timedelta(minutes=settings.TASK_REMINDER_LEAD_MINUTES)
+    with Session(engine) as session:
+        rows = session.exec(
+            select(Task.id, Task.due_date).where(
+                *_open_unreminded(),
+                Task.due_date > utc_now(),
+                Task.due_date <= naive_utc(until + lead),
+            )
+        ).all()
+    return [(row.id, row.due_date) for row in rows]
+
+
+def send_reminders(entries: list[tuple[uuid.UUID, datetime]]) -> None:
+    """
+    Claim the reminders of the given (id, due_date) and push a task.reminder
+    event to their owners. Only tasks still open with the same due_date are
+    claimed, so stale entries and the other workers' copies are no-ops.
+    """
+    with Session(engine) as session:
+        claimed = session.execute(
+            update(Task)
+            .where(
+                tuple_(Task.id, Task.due_date).in_([(task_id, naive_utc(due_date)) for task_id, due_date in entries]),
+                *_open_unreminded(),
+            )
+            .values(reminder_sent_at=utc_now())
+            .returning(Task.id, Task.owner_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        by_owner: dict[uuid.UUID, list[uuid.UUID]] = defaultdict(list)
+        for task in claimed:
+            by_owner[task.owner_id].append(task.id)
+        realtime.publish(session, (
+            realtime.task_event("task.reminder", owner_id, task_ids)
+            for owner_id, task_ids in by_owner.items()
+        ))
+        session.commit()
+
+
+class ReminderScheduler:
+    """
+    Min-heap of the reminders due within the next horizon, so waiting for the
+    next one costs nothing and firing one is O(log n).
+    The window is reloaded from the database every half horizon, and the task
+    routes keep it up to date in between through schedule() and cancel().
+    Entries are invalidated lazily: _due holds the current due_date of each
+    scheduled task and heap entries that don't match it are skipped.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, uuid.UUID, datetime]] = []
+        self._due: dict[uuid.UUID, datetime] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup = asyncio.Event()
+
+    @property
+    def _lead(self) -> timedelta:
+        return timedelta(minutes=settings.TASK_REMINDER_LEAD_MINUTES)
+
+    @property
+    def _horizon(self) -> timedelta:
+        return timedelta(minutes=settings.TASK_REMINDER_HORIZON_MINUTES)
+
+    def schedule(self, task_id: uuid.UUID, due_date: datetime | None) -> None:
+        """
+        (Re)schedule the reminder of a task, from any thread.
+        A no-op when the scheduler isn't running.
+        """
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._schedule, task_id, due_date)
+
+    def cancel(self, task_id: uuid.UUID) -> None:
+        self.schedule(task_id, None)
+
+    def _schedule(self, task_id: uuid.UUID, due_date: datetime | None) -> None:
+        if due_date is None:
+            self._due.pop(task_id, None)
+            return
+        if due_date.tzinfo is None:
+            # Naive datetimes are stored as UTC
+            due_date = due_date.replace(tzinfo=timezone.utc)
+        remind_at = due_date - self._lead
+        if remind_at > datetime.now(timezone.utc) + self._horizon:
+            # Out of the window, the next load picks it up
+            self._due.pop(task_id, None)
+            return
+        if self._due.get(task_id) == due_date:
+            return
+        self._due[task_id] = due_date
+        heapq.heappush(self._heap, (remind_at, task_id, due_date))
+        self._wakeup.set()
+
+    def _pop_due(self, now: datetime) -> list[tuple[uuid.UUID, datetime]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, task_id, due_date = heapq.heappop(self._heap)
+            if self._due.get(task_id) == due_date:
+                del self._due[task_id]
+                due.append((task_id, due_date))
+        return due
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        next_load = datetime.now(timezone.utc)
+        try:
+            while True:
+                now = datetime.now(timezone.utc)
+                if now >= next_load:
+                    try:
+                        upcoming = await asyncio.to_thread(load_upcoming, now + self._horizon)
+                    except Exception:
+                        logger.exception("Loading upcoming task reminders failed")
+                    else:
+                        for task_id, due_date in upcoming:
+                            self._schedule(task_id, due_date)
+                    next_load = now + self._horizon / 2
+
+                due = self._pop_due(now)
+                if due:
+                    try:
+                        await asyncio.to_thread(send_reminders, due)
+                    except Exception:
+                        logger.exception("Sending task reminders failed")
+
+                wake_at = min(self._heap[0][0], next_load) if self._heap else next_load
+                self._wakeup.clear()
+                try:
+                    timeout = max((wake_at - datetime.now(timezone.utc)).total_seconds(), 0)
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._loop = None
+
+
+reminders = ReminderScheduler()
@@ -0,0 +1,26 @@
+"""
+Every timestamp column holds naive UTC (datetime.utcnow() on the Python
+side). Values compared with or written to them must be naive UTC too:
+Postgres converts between timestamp and timestamptz with the session
+TimeZone, which would shift them by its offset on a non-UTC server.
+"""
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import DateTime, func
+
+
+def utc_now() -> Any:
+    """
+    The transaction's now() as naive UTC, for SQL writes and comparisons
+    """
+    return func.timezone("UTC", func.now(), type_=DateTime)
+
+
+def naive_utc(value: datetime) -> datetime:
+    """
+    A Python datetime as the columns store it, aware ones converted to UTC
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -1,10 +1,14 @@
 import uuid
+from collections.abc import Sequence
 from typing import Any
 
+from sqlalchemy import Row, Uuid, any_, case, delete, exists, func, insert, literal, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlmodel import Session, select
 
 from app.core.security import get_password_hash, verify_password
-from app.models import  User, UserCreate, UserUpdate
+from app.core.timestamps import utc_now
+from app.models import Categories, ETaskStatus, Task, User, UserCreate, UserUpdate
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -45,3 +49,133 @@ def authenticate(*, session: Session, email: str, password: str) -> User | None:
         return None
     return db_user
 
+
+
+def id_in(column: Any, ids: Sequence[uuid.UUID]) -> Any:
+    """
+    column = ANY(:ids), a single array parameter however many ids are sent
+    """
+    return column == any_(literal(list(ids), ARRAY(Uuid())))
+
+
+def partition_skipped_ids(
+    *,
+    session: Session,
+    model: Any,
+    requested: Sequence[uuid.UUID],
+    affected: Sequence[uuid.UUID],
+    owner_id: uuid.UUID | None,
+) -> tuple[list[uuid.UUID], list[uuid.UUID]]:
+    """
+    Split the ids an owner-scoped bulk statement did not touch into
+    (forbidden, missing). Only queries when something was skipped.
+    """
+    skipped = list(set(requested) - set(affected))
+    if not skipped or owner_id is None:
+        return [], skipped
+    statement = select(model.id).where(id_in(model.id, skipped))
+    forbidden = list(session.exec(statement).all())
+    return forbidden, list(set(skipped) - set(forbidden))
+
+
+def delete_owned(
+    *,
+    session: Session,
+    model: Any,
+    owner_id: uuid.UUID | None,
+    ids: Sequence[uuid.UUID] | None = None,
+) -> list[uuid.UUID]:
+    """
+    Delete rows of model in one DELETE ... RETURNING id, restricted to
+    owner_id unless it is None and to ids unless it is None.
+    Children go through the ON DELETE CASCADE foreign keys, not the ORM.
+    """
+    statement = (
+        delete(model)
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    )
+    if ids is not None:
+        statement = statement.where(id_in(model.id, ids))
+    if owner_id is not None:
+        statement = statement.where(model.owner_id == owner_id)
+    return list(session.execute(statement).scalars())
+
+
+def update_tasks_status(
+    *,
+    session: Session,
+    task_ids: Sequence[uuid.UUID],
+    status: ETaskStatus,
+    owner_id: uuid.UUID | None,
+) -> list[uuid.UUID]:
+    """
+    Set the status of the given tasks in one UPDATE, restricted to owner_id
+    unless it is None. Returns the ids that were updated.
+    """
+    statement = (
+        update(Task)
+        .where(id_in(Task.id, task_ids))
+        .values(status=status, updated_at=utc_now(), version=Task.version + 1)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    if owner_id is not None:
+        statement = statement.where(Task.owner_id == owner_id)
+    return list(session.execute(statement).scalars())
+
+
+# Every stored task column except the search_vector the database maintains
+TASK_COLUMNS = [column for column in Task.__table__.c if column.key != "search_vector"]
+
+
+def create_task(*, session: Session, task_data: dict[str, Any]) -> Row[Any]:
+    """
+    INSERT ... RETURNING the stored row, no refresh round trip needed
+    """
+    statement = insert(Task).values(**task_data).returning(*TASK_COLUMNS)
+    return session.execute(statement).one()
+
+
+def update_task(
+    *,
+    session: Session,
+    task_id: uuid.UUID,
+    owner_id: uuid.UUID | None,
+    values: dict[str, Any],
+    expected_version: int | None = None,
+) -> Row[Any] | None:
+    """
+    Apply values to one task in a single owner-scoped UPDATE ... RETURNING,
+    joined to its category title. A new categories_id must belong to the
+    owner as well, and the task must still be at expected_version when it is
+    given. Returns None when no row matched.
+    """
+    if "due_date" in values:
+        # A moved deadline gets its reminder and may become overdue again
+        moved = Task.due_date.is_distinct_from(values["due_date"])
+        values = {
+            **values,
+            "overdue_notified_at": case((moved, None), else_=Task.overdue_notified_at),
+            "reminder_sent_at": case((moved, None), else_=Task.reminder_sent_at),
+        }
+    statement = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(**values, updated_at=utc_now(), version=Task.version + 1)
+        .returning(*TASK_COLUMNS)
+    )
+    if owner_id is not None:
+        statement = statement.where(Task.owner_id == owner_id)
+    if expected_version is not None:
+        statement = statement.where(Task.version == expected_version)
+    if values.get("categories_id") is not None:
+        category_check = Categories.id == values["categories_id"]
+        if owner_id is not None:
+            category_check = category_check & (Categories.owner_id == owner_id)
+        statement = statement.where(exists().where(category_check))
+    updated = statement.cte("updated")
+    return session.execute(
+        select(updated, func.coalesce(Categories.title, "").label("category_title"))
+        .outerjoin(Categories, Categories.id == updated.c.categories_id)
+    ).first()
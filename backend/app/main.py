@@ -1,17 +1,36 @@
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
+from sqlalchemy.orm.exc import StaleDataError
 from starlette.middleware.cors import CORSMiddleware
 from app.api.main import api_router
 from app.core.config import settings
-from app.api import cronjob
-from typing import Annotated
-from fastapi import APIRouter, Depends, WebSocket
+from app.api import archive, cronjob, rebalancer
+from app.core.realtime import hub
+from app.core.scheduler import reminders
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 import asyncio
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    workers = []
+    if settings.BACKGROUND_WORKERS_ENABLED:
+        workers.append(asyncio.create_task(cronjob.run_overdue_scanner()))
+        workers.append(asyncio.create_task(hub.listen()))
+        workers.append(asyncio.create_task(reminders.run()))
+        workers.append(asyncio.create_task(archive.run_archiver()))
+        workers.append(asyncio.create_task(rebalancer.run_rebalancer()))
+    yield
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
@@ -19,17 +38,8 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
-# @app.websocket("/ws") 
-# async def websocket_endpoint(websocket: WebSocket): 
-#     b = Annotated[cronjob.cronjob, Depends()] 
-#     await websocket.accept() 
-#     while True: 
-#         if b: 
-#             await websocket.send_text("You have overdue tasks!") 
-#             await asyncio.sleep(60) # Chỉ gửi thông báo mỗi phút 
-#         else: 
-#             await asyncio.sleep(10) 
 # Set all CORS enabled origins
 if settings.all_cors_origins:
     app.add_middleware(
@@ -40,4 +50,12 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+
+
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError) -> JSONResponse:
+    # A versioned row changed between reading and updating it
+    return JSONResponse(status_code=409, content={"detail": "The resource was modified, reload it and retry"})
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
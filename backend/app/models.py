@@ -2,12 +2,13 @@ import uuid
 
 from pydantic import EmailStr
 from sqlmodel import Field, Relationship, SQLModel, ARRAY
-from sqlalchemy import Column 
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import BigInteger, Column, Computed, Index, String, text
+from sqlalchemy.orm import declared_attr
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 
 from enum import Enum
-from typing import Optional, List
-from datetime import datetime
+from typing import Any, Optional, List
+from datetime import date, datetime
 
 
 # =========================
@@ -19,11 +20,49 @@ class ETaskStatus(str, Enum):
     COMPLETED = "Completed"
     CANCELLED = "Cancelled"
 
+# Declared most urgent first. Postgres orders enum values by their position
+# in the type, which was created in this order, so ORDER BY priority puts
+# High first rather than comparing the labels alphabetically.
 class ETaskPriority(str, Enum):
     HIGH = "High"
     MEDIUM = "Medium"
     LOW = "Low"
 
+class ESearchMode(str, Enum):
+    FULLTEXT = "fulltext"  # word prefix match ranked by relevance (tasks only)
+    SUBSTRING = "substring"  # infix match anywhere in the text
+    FUZZY = "fuzzy"  # trigram similarity, tolerant to typos
+    UNACCENT = "unaccent"  # infix match ignoring case and diacritics ("cong viec" finds "Công việc")
+
+class EFileFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class EImportStatus(str, Enum):
+    PENDING = "Pending"
+    RUNNING = "Running"
+    COMPLETED = "Completed"
+    FAILED = "Failed"
+
+class ECountMode(str, Enum):
+    EXACT = "exact"  # COUNT(*) over the filtered rows
+    CACHED = "cached"  # read the maintained per-owner counter, exact when unfiltered
+    NONE = "none"  # skip counting, count is returned as null
+
+class ETaskInclude(str, Enum):
+    NOTES = "notes"
+    NOTE_COUNT = "note_count"
+
+class ETaskSort(str, Enum):
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    DUE_DATE = "due_date"  # tasks without due date come last ascending, first descending
+    PRIORITY = "priority"
+
+class ESortDirection(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
 # =========================
 # USER MODELS
 # =========================
@@ -67,9 +106,9 @@ class UpdatePassword(SQLModel):
 class User(UserBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
-    categories: list["Categories"] = Relationship(back_populates="owner", cascade_delete=True)
-    notes: list["Notes"] = Relationship(back_populates="owner", cascade_delete=True)
-    tasks: list["Task"] = Relationship(back_populates="owner", cascade_delete=True)
+    categories: list["Categories"] = Relationship(back_populates="owner", cascade_delete=True, passive_deletes=True)
+    notes: list["Notes"] = Relationship(back_populates="owner", cascade_delete=True, passive_deletes=True)
+    tasks: list["Task"] = Relationship(back_populates="owner", cascade_delete=True, passive_deletes=True)
 
 # Properties to return via API, id is always required
 class UserPublic(UserBase):
@@ -99,26 +138,40 @@ class CategoriesCreate(CategoriesBase):
 class CategoriesUpdate(CategoriesBase):
     title: str | None = Field(default=None, min_length=1, max_length=255)  # type: ignore
     description: str | None = Field(default=None, max_length=255, nullable=True)  # Description is optional
+    version: int | None = None
 
 # Database model, database table inferred from class name
 
 class Categories(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_categories_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_categories_description_trgm", "description", postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)  # UUID primary key
     title: str = Field(max_length=255, nullable=False)  # Title is required
     description: str | None = Field(default=None, max_length=255, nullable=True)  # Description is optional
-    tasks: list["Task"] = Relationship(back_populates="category", cascade_delete=True)
+    tasks: list["Task"] = Relationship(back_populates="category", cascade_delete=True, passive_deletes=True)
     owner: Optional[User] = Relationship(back_populates="categories")
     owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=True, ondelete="CASCADE")
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+
+    # ORM updates only apply when version is still the one loaded, and bump it
+    @declared_attr
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return {"version_id_col": cls.__table__.c.version}
+
 # Properties to return via API, id is always required
 class CategoryPublic(CategoriesBase):
     id: uuid.UUID
+    version: int
     title: str
     description: str | None
 
 
 class CategoriesPublic(SQLModel):
     data: list[CategoryPublic]
-    count: int
+    count: Optional[int]
     
 
 
@@ -149,26 +202,183 @@ class TaskUpdate(SQLModel):
     due_date: Optional[datetime] = None
     categories_id: Optional[uuid.UUID] = None
     # notes_id: Optional[uuid.UUID] = None
+    # Version the edit is based on, 409 if the task changed since (or If-Match)
+    version: Optional[int] = None
 
 # Task database model
 class Task(TaskBase, table=True):
+    __table_args__ = (
+        # Serves keyset pagination of an owner's tasks on (created_at, id)
+        Index("ix_task_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        # Serves the delta sync scan of an owner's tasks changed since a watermark
+        Index("ix_task_owner_id_updated_at_id", "owner_id", "updated_at", "id"),
+        # Serve the other sort orders of the task list, scanned backwards
+        # for descending ones, and the due date range filter of /tasks/search
+        Index("ix_task_owner_id_due_date_id", "owner_id", "due_date", "id"),
+        Index("ix_task_owner_id_priority_id", "owner_id", "priority", "id"),
+        # Serves the status/priority filters of /tasks/search
+        Index("ix_task_owner_id_status_priority", "owner_id", "status", "priority"),
+        # Serves the columns of the board, in their manual (position, id) order
+        Index("ix_task_owner_id_status_position_id", "owner_id", "status", "position", "id"),
+        # Columns the position rebalancer has to respace: unplaced tasks or
+        # keys grown too long (keep in sync with app.api.rebalancer.POSITION_MAX_LENGTH)
+        Index(
+            "ix_task_unbalanced_position",
+            "owner_id",
+            "status",
+            postgresql_where=text("position IS NULL OR length(position) > 24"),
+        ),
+        Index("ix_task_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_task_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_task_description_trgm", "description", postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+        # Only the open tasks not yet reported as overdue, so the overdue
+        # scanner reads a short range instead of every task
+        Index(
+            "ix_task_overdue_due_date",
+            "due_date",
+            postgresql_where=text(
+                "due_date IS NOT NULL AND overdue_notified_at IS NULL "
+                "AND status NOT IN ('COMPLETED', 'CANCELLED')"
+            ),
+        ),
+        # Same for the upcoming reminders loaded by the reminder scheduler
+        Index(
+            "ix_task_reminder_due_date",
+            "due_date",
+            postgresql_where=text(
+                "due_date IS NOT NULL AND reminder_sent_at IS NULL "
+                "AND status NOT IN ('COMPLETED', 'CANCELLED')"
+            ),
+        ),
+        # Closed tasks by age, the archiver picks its batches from the oldest
+        Index(
+            "ix_task_closed_updated_at",
+            "updated_at",
+            postgresql_where=text("status IN ('COMPLETED', 'CANCELLED')"),
+        ),
+    )
+    @declared_attr
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return {
+            # search_vector is maintained by Postgres and only used in WHERE/ORDER BY,
+            # keep it out of the mapper so it is never loaded with the row
+            "exclude_properties": ["search_vector"],
+            "version_id_col": cls.__table__.c.version,
+        }
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
-    categories_id: Optional[uuid.UUID] = Field(foreign_key="categories.id", nullable=True)
+    categories_id: Optional[uuid.UUID] = Field(foreign_key="categories.id", nullable=True, ondelete="CASCADE")
+    # Bumped by every update, writes compare-and-swap on it
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+    # Set by the overdue scanner once the owner was told, reset when due_date moves
+    overdue_notified_at: Optional[datetime] = None
+    # Set by the reminder scheduler once the reminder was sent, same reset
+    reminder_sent_at: Optional[datetime] = None
+    # Manual order within the task's status column, a fractional index key
+    # (see app/core/fractional_index.py). NULL until placed, sorted last.
+    position: Optional[str] = Field(default=None, sa_type=String(collation="C"))
+    search_vector: Optional[str] = Field(
+        default=None,
+        sa_column=Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        ),
+    )
     owner: Optional[User] = Relationship(back_populates="tasks")
     category: Optional[Categories] = Relationship(back_populates="tasks")
-    note: list["Notes"] = Relationship(back_populates="task", cascade_delete=True)
+    note: list["Notes"] = Relationship(back_populates="task", cascade_delete=True, passive_deletes=True)
     
 class TaskPublic(TaskBase):
     id: uuid.UUID
     category_title: str = None
     owner_id: Optional[uuid.UUID]
     categories_id: Optional[uuid.UUID]
+    version: int
+    position: Optional[str] = None
     # notes_id: Optional[List[uuid.UUID]]
+    # Only filled when asked for with ?include=
+    notes: Optional[list["NotePublic"]] = None
+    note_count: Optional[int] = None
 
 class TasksPublic(SQLModel):
     data: list[TaskPublic]
-    count: int
+    count: Optional[int]
+    # Opaque cursor for the next page, None when this page is the last one
+    next_cursor: Optional[str] = None
+
+
+# Id of a deleted task, kept for a while so clients can sync the delete
+# (filled by a trigger, see migration 882faf6f1ac5)
+class TaskTombstone(SQLModel, table=True):
+    __tablename__ = "task_tombstone"
+    __table_args__ = (
+        Index("ix_task_tombstone_owner_id_deleted_at", "owner_id", "deleted_at"),
+    )
+
+    task_id: uuid.UUID = Field(primary_key=True)
+    owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    deleted_at: datetime
+
+
+class TaskChanges(SQLModel):
+    data: list[TaskPublic]
+    deleted: list[uuid.UUID]
+    # Token for the next call, right away while has_more is true
+    next_since: str
+    has_more: bool
+
+
+# Where to drop a task: between two tasks of the target column, given by
+# id. Only after_id puts it right after that task, only before_id right
+# before it, neither at the end of the column.
+class TaskMove(SQLModel):
+    status: Optional[ETaskStatus] = None  # the column, the task's own by default
+    after_id: Optional[uuid.UUID] = None
+    before_id: Optional[uuid.UUID] = None
+    # Version the move is based on, 409 if the task changed since (or If-Match)
+    version: Optional[int] = None
+
+
+# One status column of the task board
+class BoardColumn(SQLModel):
+    status: ETaskStatus
+    # Tasks in the column, None on "load more" pages
+    total: Optional[int]
+    data: list[TaskPublic]
+    # Cursor to load more of this column, None when it is all there
+    next_cursor: Optional[str] = None
+
+
+class TaskBoard(SQLModel):
+    columns: list[BoardColumn]
+
+
+class CalendarTask(SQLModel):
+    id: uuid.UUID
+    title: str
+    status: ETaskStatus
+    priority: ETaskPriority
+    due_date: datetime
+
+
+# Tasks due on one day of the calendar, in the requested time zone
+class CalendarDay(SQLModel):
+    day: date
+    total: int
+    by_status: dict[ETaskStatus, int]
+    by_priority: dict[ETaskPriority, int]
+    # The first tasks of the day by due time, up to per_day
+    tasks: list[CalendarTask]
+
+
+class TaskCalendar(SQLModel):
+    # Only the days with tasks due
+    data: list[CalendarDay]
     
 
 
@@ -180,6 +390,63 @@ class UsersPublic(SQLModel):
 
 
 
+# =========================
+# TASK IMPORT MODELS
+# =========================
+
+# Progress of a bulk task import, polled by the client while it runs
+class TaskImportJob(SQLModel, table=True):
+    __tablename__ = "task_import_job"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    format: EFileFormat
+    status: EImportStatus = Field(default=EImportStatus.PENDING)
+    processed_rows: int = 0  # rows read from the file so far
+    imported_rows: int = 0
+    failed_rows: int = 0
+    # First errors as {"line": int, "error": str}, capped to keep the row small
+    errors: list[dict] = Field(default_factory=list, sa_column=Column(JSONB, nullable=False, server_default="[]"))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+
+class TaskImportJobPublic(SQLModel):
+    id: uuid.UUID
+    format: EFileFormat
+    status: EImportStatus
+    processed_rows: int
+    imported_rows: int
+    failed_rows: int
+    errors: list[dict]
+    created_at: datetime
+    finished_at: Optional[datetime]
+
+
+# =========================
+# COUNTER MODELS
+# =========================
+
+# Per-owner totals kept in sync by triggers on task, notes and categories
+# (see migration c41e9a8f3b27), so list endpoints don't need COUNT(*)
+class UserCounters(SQLModel, table=True):
+    __tablename__ = "user_counters"
+
+    owner_id: uuid.UUID = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    task_total: int = 0
+    task_pending: int = 0
+    task_in_progress: int = 0
+    task_completed: int = 0
+    task_cancelled: int = 0
+    task_high: int = 0
+    task_medium: int = 0
+    task_low: int = 0
+    note_total: int = 0
+    category_total: int = 0
+    # Bumped by the counter triggers on every task, note and category write
+    generation: int = Field(default=0, sa_type=BigInteger)
+
+
 # =========================
 # NOTES MODELS
 # =========================
@@ -196,14 +463,27 @@ class NoteCreate(NoteBase):
 class NoteUpdate(SQLModel):
     title: Optional[str] = Field(default=None, min_length=1, max_length=255)
     description: Optional[str] = None
+    version: Optional[int] = None
     
 # Database model, database table inferred from class name
 class Notes(NoteBase, table=True):
+    __table_args__ = (
+        Index("ix_notes_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_notes_description_trgm", "description", postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+        # Serves loading the notes of a page of tasks
+        Index("ix_notes_task_id", "task_id"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)  # UUID primary key
     task:  Optional[Task]= Relationship(back_populates="note")
     task_id: uuid.UUID = Field(foreign_key="task.id", nullable=False, ondelete="CASCADE")
     owner: Optional[User] = Relationship(back_populates="notes")
     owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+
+    @declared_attr
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return {"version_id_col": cls.__table__.c.version}
 
 # Properties to return via API, id is always required
 class NotePublic(NoteBase):
@@ -212,11 +492,65 @@ class NotePublic(NoteBase):
     description: str | None
     task_id: uuid.UUID
     owner_id: uuid.UUID
+    version: int
 
 
 class NotesPublic(SQLModel):
     data: list[NotePublic]
-    count: int
+    count: Optional[int]
+
+
+# =========================
+# ARCHIVE MODELS
+# =========================
+
+# Closed tasks moved out of task by the archiver (see app/api/archive.py), so
+# the hot table and its indexes only hold the working set. Same columns as
+# task minus the scanner/scheduler flags, only read with ?include_archived=.
+class TaskArchive(TaskBase, table=True):
+    __tablename__ = "task_archive"
+    __table_args__ = (
+        Index("ix_task_archive_owner_id_created_at_id", "owner_id", "created_at", "id"),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
+
+    id: uuid.UUID = Field(primary_key=True)
+    owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    categories_id: Optional[uuid.UUID] = Field(foreign_key="categories.id", nullable=True, ondelete="CASCADE")
+    version: int
+    archived_at: datetime
+    search_vector: Optional[str] = Field(
+        default=None,
+        sa_column=Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        ),
+    )
+
+
+# Notes of the archived tasks
+class NotesArchive(NoteBase, table=True):
+    __tablename__ = "notes_archive"
+    __table_args__ = (
+        Index("ix_notes_archive_task_id", "task_id"),
+    )
+
+    id: uuid.UUID = Field(primary_key=True)
+    task_id: uuid.UUID = Field(foreign_key="task_archive.id", nullable=False, ondelete="CASCADE")
+    owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    version: int
+
+
+# TaskPublic embeds notes, resolve the forward reference now NotePublic exists
+TaskPublic.model_rebuild()
+TasksPublic.model_rebuild()
+TaskChanges.model_rebuild()
+BoardColumn.model_rebuild()
+TaskBoard.model_rebuild()
 
 
 # =========================
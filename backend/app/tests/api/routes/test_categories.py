@@ -0,0 +1,32 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models import Categories, Task
+from app.tests.utils.task import create_random_task
+from app.tests.utils.user import authentication_token_from_email, create_random_user
+
+
+def test_delete_categories_only_deletes_the_users_own(
+    client: TestClient, db: Session
+) -> None:
+    user, other = create_random_user(db), create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    mine = [Categories(title="mine", owner_id=user.id) for _ in range(2)]
+    others = Categories(title="others", owner_id=other.id)
+    db.add_all([*mine, others])
+    db.commit()
+    task = create_random_task(db, user, categories_id=mine[0].id)
+    other_task = create_random_task(db, other, categories_id=others.id)
+
+    r = client.delete(f"{settings.API_V1_STR}/categories", headers=headers)
+    assert r.status_code == 200
+    db.expire_all()
+    assert db.exec(select(Categories).where(Categories.owner_id == user.id)).all() == []
+    # The tasks of a deleted category go with it
+    assert db.get(Task, task.id) is None
+    assert db.get(Categories, others.id) is not None
+    assert db.get(Task, other_task.id) is not None
+
+    r = client.delete(f"{settings.API_V1_STR}/categories", headers=headers)
+    assert r.status_code == 404
@@ -0,0 +1,53 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models import Notes, User
+from app.tests.utils.task import create_random_task
+from app.tests.utils.user import authentication_token_from_email, create_random_user
+
+
+def _create_note(db: Session, owner: User) -> Notes:
+    note = Notes(title="note", task_id=create_random_task(db, owner).id, owner_id=owner.id)
+    db.add(note)
+    db.commit()
+    db.refresh(note)
+    return note
+
+
+def test_delete_notes(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    notes = [_create_note(db, user) for _ in range(2)]
+
+    r = client.request(
+        "DELETE", f"{settings.API_V1_STR}/notes/notes", headers=headers, json=[str(n.id) for n in notes]
+    )
+    assert r.status_code == 200
+    db.expire_all()
+    assert all(db.get(Notes, note.id) is None for note in notes)
+
+
+def test_delete_notes_skipped_ids_delete_nothing(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    mine = _create_note(db, user)
+    other = _create_note(db, create_random_user(db))
+
+    r = client.request(
+        "DELETE", f"{settings.API_V1_STR}/notes/notes", headers=headers, json=[str(mine.id), str(other.id)]
+    )
+    assert r.status_code == 400
+
+    r = client.request(
+        "DELETE", f"{settings.API_V1_STR}/notes/notes", headers=headers, json=[str(mine.id), str(uuid.uuid4())]
+    )
+    assert r.status_code == 404
+
+    db.expire_all()
+    assert db.get(Notes, mine.id) is not None
+    assert db.get(Notes, other.id) is not None
@@ -0,0 +1,875 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.api import archive, export, importer
+from app.api.routes import tasks as tasks_route
+from app.core.config import settings
+from app.models import Categories, ETaskPriority, ETaskStatus, Notes, Task
+from app.tests.utils.task import create_random_task
+from app.tests.utils.user import authentication_token_from_email, create_random_user
+
+
+def test_read_tasks_cursor_pages_do_not_overlap(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    created = {str(create_random_task(db, user).id) for _ in range(5)}
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/?limit=3", headers=headers)
+    assert r.status_code == 200
+    first_page = r.json()
+    assert len(first_page["data"]) == 3
+    assert first_page["next_cursor"]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"limit": 3, "cursor": first_page["next_cursor"]},
+    )
+    assert r.status_code == 200
+    second_page = r.json()
+    assert len(second_page["data"]) == 2
+    assert second_page["next_cursor"] is None
+
+    seen = [t["id"] for t in first_page["data"] + second_page["data"]]
+    assert len(seen) == len(set(seen))
+    assert set(seen) == created
+
+
+def test_read_tasks_invalid_cursor(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=normal_user_token_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Invalid cursor"
+
+
+def test_update_tasks_status(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    tasks = [create_random_task(db, user) for _ in range(3)]
+    missing_id = str(uuid.uuid4())
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/tasks/status",
+        headers=headers,
+        params={"task_ids": [str(t.id) for t in tasks] + [missing_id], "status": "Completed"},
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert sorted(content["updated"]) == sorted(str(t.id) for t in tasks)
+    assert content["missing"] == [missing_id]
+    for task in tasks:
+        db.refresh(task)
+        assert task.status == ETaskStatus.COMPLETED
+
+
+def test_update_tasks_status_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    other_task = create_random_task(db, create_random_user(db))
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/tasks/status",
+        headers=normal_user_token_headers,
+        params={"task_ids": [str(other_task.id)], "status": "Completed"},
+    )
+    assert r.status_code == 400
+    db.refresh(other_task)
+    assert other_task.status == ETaskStatus.PENDING
+
+
+def test_delete_tasks_reports_missing_ids(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    tasks = [create_random_task(db, user) for _ in range(2)]
+    missing_id = str(uuid.uuid4())
+
+    r = client.request(
+        "DELETE",
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        json=[str(t.id) for t in tasks] + [missing_id],
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert sorted(content["deleted"]) == sorted(str(t.id) for t in tasks)
+    assert content["missing"] == [missing_id]
+    db.expire_all()
+    assert db.exec(select(Task).where(Task.owner_id == user.id)).all() == []
+
+    r = client.request("DELETE", f"{settings.API_V1_STR}/tasks/", headers=headers, json=[missing_id])
+    assert r.status_code == 404
+
+
+def test_delete_tasks_partly_owned_deletes_nothing(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    mine = create_random_task(db, user)
+    other = create_random_task(db, create_random_user(db))
+
+    r = client.request(
+        "DELETE",
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        json=[str(mine.id), str(other.id)],
+    )
+    assert r.status_code == 400
+    db.expire_all()
+    assert db.get(Task, mine.id) is not None
+    assert db.get(Task, other.id) is not None
+
+def test_read_tasks_not_modified_until_a_write(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    create_random_task(db, user)
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/", headers=headers)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/", headers={**headers, "If-None-Match": etag}
+    )
+    assert r.status_code == 304
+    assert r.content == b""
+
+    create_random_task(db, user)
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/", headers={**headers, "If-None-Match": etag}
+    )
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+
+
+def test_read_tasks_modified_by_the_first_write(
+    client: TestClient, db: Session
+) -> None:
+    # No user_counters row yet: the first write must still change the tag
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/", headers=headers)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+
+    r = client.post(f"{settings.API_V1_STR}/tasks/", headers=headers, json={"title": "first"})
+    assert r.status_code == 200
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/", headers={**headers, "If-None-Match": etag}
+    )
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert [task["title"] for task in r.json()["data"]] == ["first"]
+
+def test_if_none_match_star_only_matches_an_existing_task(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = {**authentication_token_from_email(client=client, email=user.email, db=db), "If-None-Match": "*"}
+    task = create_random_task(db, user)
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/{task.id}", headers=headers)
+    assert r.status_code == 304
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/{uuid.uuid4()}", headers=headers)
+    assert r.status_code == 404
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/", headers=headers)
+    assert r.status_code == 200
+
+
+def test_task_changes_report_updates_and_deletes(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    kept = create_random_task(db, user)
+    removed = create_random_task(db, user)
+    # Don't hold a transaction open, it would keep the sync watermark back
+    db.commit()
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/changes", headers=headers)
+    assert r.status_code == 200
+    initial = r.json()
+    assert {t["id"] for t in initial["data"]} == {str(kept.id), str(removed.id)}
+    assert initial["deleted"] == []
+    assert initial["has_more"] is False
+
+    r = client.delete(f"{settings.API_V1_STR}/tasks/{removed.id}", headers=headers)
+    assert r.status_code == 200
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/changes",
+        headers=headers,
+        params={"since": initial["next_since"]},
+    )
+    assert r.status_code == 200
+    changes = r.json()
+    assert changes["data"] == []
+    assert changes["deleted"] == [str(removed.id)]
+
+
+def test_task_changes_pages_with_small_limit(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    created = {str(create_random_task(db, user).id) for _ in range(3)}
+    db.commit()
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/changes", headers=headers, params={"limit": 2})
+    assert r.status_code == 200
+    first = r.json()
+    assert len(first["data"]) == 2
+    assert first["has_more"] is True
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/changes",
+        headers=headers,
+        params={"limit": 2, "since": first["next_since"]},
+    )
+    assert r.status_code == 200
+    second = r.json()
+    assert second["has_more"] is False
+    assert {t["id"] for t in first["data"] + second["data"]} == created
+
+
+def test_read_tasks_sparse_fields(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    task = create_random_task(db, user)
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"fields": "id,title,status,due_date"},
+    )
+    assert r.status_code == 200
+    assert r.json()["data"] == [
+        {"id": str(task.id), "title": task.title, "status": "Pending", "due_date": None}
+    ]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/", headers=headers, params={"fields": "id,secret"}
+    )
+    assert r.status_code == 400
+
+
+def test_read_tasks_include_notes(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    with_note = create_random_task(db, user)
+    without_note = create_random_task(db, user)
+    note = Notes(title="note", task_id=with_note.id, owner_id=user.id)
+    db.add(note)
+    db.commit()
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"include": "notes,note_count"},
+    )
+    assert r.status_code == 200
+    tasks = {t["id"]: t for t in r.json()["data"]}
+    assert [n["id"] for n in tasks[str(with_note.id)]["notes"]] == [str(note.id)]
+    assert tasks[str(with_note.id)]["note_count"] == 1
+    assert tasks[str(without_note.id)]["notes"] == []
+    assert tasks[str(without_note.id)]["note_count"] == 0
+
+
+def test_read_tasks_limit(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=normal_user_token_headers,
+        params={"limit": 0},
+    )
+    assert r.status_code == 422
+
+    # Large pages keep working for skip/limit clients
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=normal_user_token_headers,
+        params={"limit": 5000},
+    )
+    assert r.status_code == 200
+
+
+def test_read_tasks_count_modes(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    for _ in range(3):
+        create_random_task(db, user)
+    create_random_task(db, user, title="needle")
+    create_random_task(db, create_random_user(db))
+
+    counts = {}
+    for mode in ("exact", "cached", "none"):
+        r = client.get(f"{settings.API_V1_STR}/tasks/", headers=headers, params={"count": mode, "limit": 2})
+        assert r.status_code == 200
+        counts[mode] = r.json()["count"]
+    assert counts == {"exact": 4, "cached": 4, "none": None}
+
+    # The counters only cover the unfiltered list, a search counts its rows
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"count": "cached", "search": "needle", "search_mode": "substring"},
+    )
+    assert r.status_code == 200
+    assert r.json()["count"] == 1
+
+def test_update_task_stale_if_match(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    task = create_random_task(db, user)
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/{task.id}", headers=headers)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+
+    r = client.put(
+        f"{settings.API_V1_STR}/tasks/{task.id}",
+        headers={**headers, "If-Match": etag},
+        json={"title": "first"},
+    )
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+
+    r = client.put(
+        f"{settings.API_V1_STR}/tasks/{task.id}",
+        headers={**headers, "If-Match": etag},
+        json={"title": "second"},
+    )
+    assert r.status_code == 409
+    db.refresh(task)
+    assert task.title == "first"
+
+
+def test_update_task_unmatched_without_a_reason_is_a_conflict(
+    client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    task = create_random_task(db, user)
+
+    r = client.put(
+        f"{settings.API_V1_STR}/tasks/{task.id}",
+        headers=headers,
+        params={"categories_id": str(uuid.uuid4())},
+        json={"title": "moved"},
+    )
+    assert r.status_code == 404
+
+    # The compare-and-swap missing for none of the checked reasons, e.g. a
+    # concurrent delete between the UPDATE and the lookups
+    monkeypatch.setattr(tasks_route.crud, "update_task", lambda **kwargs: None)
+    r = client.put(
+        f"{settings.API_V1_STR}/tasks/{task.id}",
+        headers=headers,
+        json={"title": "moved"},
+    )
+    assert r.status_code == 409
+
+def test_read_tasks_include_archived(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    open_task = create_random_task(db, user)
+    closed_task = create_random_task(db, user)
+    closed_task.status = ETaskStatus.COMPLETED
+    db.add(closed_task)
+    db.commit()
+    closed_id = closed_task.id
+
+    assert archive.archive_batch(db, timedelta(0), 100) >= 1
+    db.commit()
+    db.expunge_all()
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/", headers=headers)
+    assert r.status_code == 200
+    assert [t["id"] for t in r.json()["data"]] == [str(open_task.id)]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/", headers=headers, params={"include_archived": True}
+    )
+    assert r.status_code == 200
+    assert {t["id"] for t in r.json()["data"]} == {str(open_task.id), str(closed_id)}
+    assert r.json()["count"] == 2
+
+
+def test_read_tasks_include_archived_keeps_positions(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    open_task = create_random_task(db, user)
+    open_task.position = "V"
+    db.add(open_task)
+    closed_task = create_random_task(db, user)
+    closed_task.status = ETaskStatus.COMPLETED
+    db.add(closed_task)
+    db.commit()
+    open_id, closed_id = open_task.id, closed_task.id
+
+    assert archive.archive_batch(db, timedelta(0), 100) >= 1
+    db.commit()
+    db.expunge_all()
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"include_archived": True, "fields": "id,position"},
+    )
+    assert r.status_code == 200
+    positions = {t["id"]: t["position"] for t in r.json()["data"]}
+    assert positions == {str(open_id): "V", str(closed_id): None}
+
+def test_read_tasks_fulltext_search_prefix_and_rank(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    in_title = create_random_task(db, user, title="Quarterly planning", description="budget")
+    in_description = create_random_task(db, user, title="Meeting", description="planning notes")
+    create_random_task(db, user, title="Groceries", description="milk")
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"search": "plan", "search_mode": "fulltext"},
+    )
+    assert r.status_code == 200
+    # Every word is a prefix, title matches (weight A) rank first
+    assert [t["id"] for t in r.json()["data"]] == [str(in_title.id), str(in_description.id)]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"search": "plan quart", "search_mode": "fulltext"},
+    )
+    assert r.status_code == 200
+    assert [t["id"] for t in r.json()["data"]] == [str(in_title.id)]
+
+
+def test_read_tasks_fulltext_search_without_words(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    create_random_task(db, user)
+    shouting = create_random_task(db, user, title="Call back!!!")
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"search": "!!!", "search_mode": "fulltext"},
+    )
+    assert r.status_code == 200
+    assert [t["id"] for t in r.json()["data"]] == [str(shouting.id)]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"search": "-", "search_mode": "fulltext"},
+    )
+    assert r.status_code == 200
+    assert r.json()["data"] == []
+
+def test_read_tasks_substring_and_fuzzy_search(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    report = create_random_task(db, user, title="Write the 50%_report")
+    create_random_task(db, user, title="Water plants")
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"search": "50%_REP", "search_mode": "substring"},
+    )
+    assert r.status_code == 200
+    assert [t["id"] for t in r.json()["data"]] == [str(report.id)]
+
+    # LIKE wildcards in the search are matched literally
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"search": "W%r", "search_mode": "substring"},
+    )
+    assert r.status_code == 200
+    assert r.json()["data"] == []
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"search": "Write the 50% reprot", "search_mode": "fuzzy"},
+    )
+    assert r.status_code == 200
+    assert [t["id"] for t in r.json()["data"]] == [str(report.id)]
+
+def test_read_tasks_unaccent_search(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    accented = create_random_task(db, user, title="Công việc hằng ngày")
+    create_random_task(db, user, title="Cong tac")
+
+    for search in ("cong viec", "CÔNG VIỆC", "Việc hằng"):
+        r = client.get(
+            f"{settings.API_V1_STR}/tasks/",
+            headers=headers,
+            params={"search": search, "search_mode": "unaccent"},
+        )
+        assert r.status_code == 200
+        assert [t["id"] for t in r.json()["data"]] == [str(accented.id)]
+
+def test_search_tasks_owner_scoped_with_uncategorized(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    mine = create_random_task(db, user)
+    mine.priority = ETaskPriority.HIGH
+    db.add(mine)
+    db.commit()
+    other = create_random_task(db, create_random_user(db))
+    other.title = mine.title
+    db.add(other)
+    db.commit()
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/search",
+        headers=headers,
+        params={"title": mine.title[2:8].upper(), "priority": "High"},
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert [t["id"] for t in content["data"]] == [str(mine.id)]
+    assert content["data"][0]["category_title"] == ""
+    assert content["count"] == 1
+
+
+def test_read_tasks_sorted_by_priority_pages(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    for priority in [ETaskPriority.LOW, ETaskPriority.HIGH, ETaskPriority.MEDIUM, ETaskPriority.HIGH]:
+        task = create_random_task(db, user)
+        task.priority = priority
+        db.add(task)
+        db.commit()
+
+    params = {"sort": "priority", "limit": 3}
+    r = client.get(f"{settings.API_V1_STR}/tasks/", headers=headers, params=params)
+    assert r.status_code == 200
+    first_page = r.json()
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={**params, "cursor": first_page["next_cursor"]},
+    )
+    assert r.status_code == 200
+    tasks = first_page["data"] + r.json()["data"]
+    assert [t["priority"] for t in tasks] == ["High", "High", "Medium", "Low"]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/",
+        headers=headers,
+        params={"sort": "due_date", "cursor": first_page["next_cursor"]},
+    )
+    assert r.status_code == 400
+
+
+def test_task_calendar_buckets_by_local_day(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    # Stored as naive UTC. 2026-03-01 23:30 UTC is already March 2nd in
+    # Ho Chi Minh City (UTC+7), 02:00 UTC is still March 1st.
+    due_dates = [
+        datetime(2026, 3, 1, 23, 30),
+        datetime(2026, 3, 2, 9, 0),
+        datetime(2026, 3, 1, 2, 0),
+    ]
+    for due_date in due_dates:
+        task = create_random_task(db, user)
+        task.due_date = due_date
+        db.add(task)
+        db.commit()
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/calendar",
+        headers=headers,
+        params={"from": "2026-03-01", "to": "2026-03-31", "tz": "Asia/Ho_Chi_Minh", "per_day": 1},
+    )
+    assert r.status_code == 200
+    days = r.json()["data"]
+    assert [(d["day"], d["total"], len(d["tasks"])) for d in days] == [
+        ("2026-03-01", 1, 1),
+        ("2026-03-02", 2, 1),
+    ]
+    assert days[1]["by_status"]["Pending"] == 2
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/calendar",
+        headers=headers,
+        params={"from": "2026-03-01", "to": "2026-03-31", "tz": "Mars/Olympus"},
+    )
+    assert r.status_code == 400
+
+
+def test_task_board_columns_and_load_more(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    pending = [create_random_task(db, user) for _ in range(3)]
+    done = create_random_task(db, user)
+    done.status = ETaskStatus.COMPLETED
+    db.add(done)
+    db.commit()
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/board", headers=headers, params={"per_column": 2})
+    assert r.status_code == 200
+    columns = {c["status"]: c for c in r.json()["columns"]}
+    assert columns["Pending"]["total"] == 3
+    assert len(columns["Pending"]["data"]) == 2
+    assert columns["Completed"]["total"] == 1
+    assert columns["Completed"]["next_cursor"] is None
+    assert columns["Cancelled"] == {"status": "Cancelled", "total": 0, "data": [], "next_cursor": None}
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/board",
+        headers=headers,
+        params={"per_column": 2, "cursor": columns["Pending"]["next_cursor"]},
+    )
+    assert r.status_code == 200
+    [column] = r.json()["columns"]
+    seen = [t["id"] for t in columns["Pending"]["data"] + column["data"]]
+    assert sorted(seen) == sorted(str(t.id) for t in pending)
+    assert column["next_cursor"] is None
+
+
+def test_move_task_between_neighbours(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    first, second, third = (create_random_task(db, user) for _ in range(3))
+
+    r = client.post(
+        f"{settings.API_V1_STR}/tasks/{third.id}/move",
+        headers=headers,
+        json={"after_id": str(first.id), "before_id": str(second.id)},
+    )
+    assert r.status_code == 200
+
+    r = client.post(
+        f"{settings.API_V1_STR}/tasks/{first.id}/move",
+        headers=headers,
+        json={"status": "In Progress"},
+    )
+    assert r.status_code == 200
+    assert r.json()["status"] == "In Progress"
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/board", headers=headers)
+    columns = {c["status"]: c for c in r.json()["columns"]}
+    assert [t["id"] for t in columns["Pending"]["data"]] == [str(third.id), str(second.id)]
+    assert [t["id"] for t in columns["In Progress"]["data"]] == [str(first.id)]
+
+
+def test_import_tasks_ndjson(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    lines = [
+        '{"title": "first", "priority": "High", "due_date": "2030-01-01T09:00:00+07:00"}',
+        "",
+        '{"title": "second", "status": "Completed"}',
+        '{"title": ""}',
+    ]
+
+    r = client.post(
+        f"{settings.API_V1_STR}/tasks/import",
+        headers=headers,
+        params={"format": "ndjson"},
+        files={"file": ("tasks.ndjson", "\n".join(lines).encode(), "application/x-ndjson")},
+    )
+    assert r.status_code == 200
+    job = r.json()
+    assert job["status"] == "Completed"
+    assert (job["processed_rows"], job["imported_rows"], job["failed_rows"]) == (3, 2, 1)
+    assert [error["line"] for error in job["errors"]] == [4]
+    assert job["finished_at"] is not None
+
+    tasks = {
+        task.title: task
+        for task in db.exec(select(Task).where(Task.owner_id == user.id)).all()
+    }
+    assert set(tasks) == {"first", "second"}
+    assert tasks["first"].priority == ETaskPriority.HIGH
+    # Stored as naive UTC like every task timestamp
+    assert tasks["first"].due_date == datetime(2030, 1, 1, 2, 0)
+    assert tasks["second"].status == ETaskStatus.COMPLETED
+
+
+def test_import_tasks_csv_rejects_foreign_categories(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    mine = Categories(title="mine", owner_id=user.id)
+    foreign = Categories(title="foreign", owner_id=create_random_user(db).id)
+    db.add_all([mine, foreign])
+    db.commit()
+    content = (
+        "title,categories_id\n"
+        f"in mine,{mine.id}\n"
+        f"in foreign,{foreign.id}\n"
+        "uncategorized,\n"
+    )
+
+    r = client.post(
+        f"{settings.API_V1_STR}/tasks/import",
+        headers=headers,
+        params={"format": "csv"},
+        files={"file": ("tasks.csv", content.encode(), "text/csv")},
+    )
+    assert r.status_code == 200
+    job = r.json()
+    assert job["status"] == "Completed"
+    assert (job["processed_rows"], job["imported_rows"], job["failed_rows"]) == (3, 2, 1)
+    assert job["errors"] == [{"line": 3, "error": "categories_id: Category not found"}]
+    titles = db.exec(select(Task.title).where(Task.owner_id == user.id)).all()
+    assert sorted(titles) == ["in mine", "uncategorized"]
+
+
+def test_import_tasks_in_background(
+    client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    monkeypatch.setattr(settings, "TASK_IMPORT_SYNC_MAX_BYTES", 0)
+    monkeypatch.setattr(importer, "PROGRESS_EVERY", 2)
+    progress: list[int] = []
+    save_progress = importer._save_progress
+    monkeypatch.setattr(
+        importer, "_save_progress", lambda job: (progress.append(job.processed_rows), save_progress(job))
+    )
+    lines = [f'{{"title": "task {i}"}}' for i in range(5)]
+
+    r = client.post(
+        f"{settings.API_V1_STR}/tasks/import",
+        headers=headers,
+        files={"file": ("tasks.ndjson", "\n".join(lines).encode(), "application/x-ndjson")},
+    )
+    assert r.status_code == 202
+    assert r.json()["status"] == "Pending"
+    # Running, then every PROGRESS_EVERY rows, then the outcome
+    assert progress == [0, 2, 4, 5]
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/import/{r.json()['id']}", headers=headers)
+    assert r.status_code == 200
+    job = r.json()
+    assert job["status"] == "Completed"
+    assert (job["processed_rows"], job["imported_rows"], job["failed_rows"]) == (5, 5, 0)
+
+    r = client.get(
+        f"{settings.API_V1_STR}/tasks/import/{job['id']}",
+        headers=authentication_token_from_email(client=client, email=create_random_user(db).email, db=db),
+    )
+    assert r.status_code == 404
+
+
+def test_export_tasks_ndjson(
+    client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+    category = Categories(title="work", owner_id=user.id)
+    db.add(category)
+    db.commit()
+    tasks = [
+        create_random_task(db, user, categories_id=category.id, due_date=datetime(2030, 1, 2, 3, 4)),
+        *(create_random_task(db, user) for _ in range(2)),
+    ]
+    create_random_task(db, create_random_user(db))
+    # Several batches of the server-side cursor
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/export", headers=headers, params={"format": "ndjson"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert r.headers["content-disposition"] == 'attachment; filename="tasks.ndjson"'
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["id"] for row in rows] == [str(task.id) for task in tasks]
+    assert list(rows[0]) == export.EXPORT_COLUMNS
+    assert rows[0]["status"] == "Pending"
+    assert rows[0]["due_date"] == "2030-01-02T03:04:00"
+    assert rows[0]["category_title"] == "work"
+    assert rows[1]["due_date"] is None
+    assert rows[1]["category_title"] is None
+
+
+def test_export_tasks_csv(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=user.email, db=db)
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/export", headers=headers, params={"format": "csv"})
+    assert r.status_code == 200
+    assert r.text.splitlines() == [",".join(export.EXPORT_COLUMNS)]
+
+    task = create_random_task(
+        db, user, title='Say "hi", then leave', priority=ETaskPriority.HIGH, due_date=datetime(2030, 1, 2, 3, 4)
+    )
+    create_random_task(db, create_random_user(db))
+
+    r = client.get(f"{settings.API_V1_STR}/tasks/export", headers=headers, params={"format": "csv"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    assert r.headers["content-disposition"] == 'attachment; filename="tasks.csv"'
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(rows) == 1
+    assert rows[0]["id"] == str(task.id)
+    assert rows[0]["title"] == 'Say "hi", then leave'
+    assert rows[0]["priority"] == "High"
+    assert rows[0]["due_date"] == "2030-01-02T03:04:00"
+    assert rows[0]["categories_id"] == ""
+    assert rows[0]["category_title"] == ""
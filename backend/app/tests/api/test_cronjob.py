@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app import crud
+from app.api import cronjob
+from app.core.db import engine
+from app.tests.utils.task import create_random_task
+from app.tests.utils.user import create_random_user
+
+
+def _claimed_ids(session: Session) -> set:
+    claimed = cronjob.claim_overdue_tasks(session, 10_000)
+    session.commit()
+    return {task.id for task in claimed}
+
+
+def test_overdue_tasks_are_claimed_once_per_due_date(db: Session) -> None:
+    user = create_random_user(db)
+    now = datetime.utcnow()
+    overdue = create_random_task(db, user, due_date=now - timedelta(minutes=5))
+    upcoming = create_random_task(db, user, due_date=now + timedelta(hours=1))
+
+    with engine.connect() as connection:
+        # Due dates are naive UTC, the session TimeZone must not shift them
+        connection.exec_driver_sql("SET TIME ZONE 'Asia/Ho_Chi_Minh'")
+        connection.commit()
+        try:
+            with Session(connection) as session:
+                claimed = _claimed_ids(session)
+                assert overdue.id in claimed
+                assert upcoming.id not in claimed
+                assert overdue.id not in _claimed_ids(session)
+
+                crud.update_task(
+                    session=session,
+                    task_id=overdue.id,
+                    owner_id=user.id,
+                    values={"due_date": now - timedelta(minutes=1)},
+                )
+                session.commit()
+                assert overdue.id in _claimed_ids(session)
+        finally:
+            connection.exec_driver_sql("RESET TIME ZONE")
+            connection.commit()
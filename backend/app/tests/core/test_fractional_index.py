@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from app.core.fractional_index import DIGITS, key_between, spread_keys
+
+
+def test_key_between_sorts_between_its_bounds() -> None:
+    keys = [key_between(None, None)]
+    rng = random.Random(0)
+    for _ in range(500):
+        i = rng.randrange(len(keys) + 1)
+        before = keys[i - 1] if i > 0 else None
+        after = keys[i] if i < len(keys) else None
+        key = key_between(before, after)
+        assert (before is None or before < key) and (after is None or key < after)
+        assert not key.endswith(DIGITS[0])
+        keys.insert(i, key)
+    assert keys == sorted(keys)
+
+
+def test_key_between_rejects_unordered_or_invalid_bounds() -> None:
+    with pytest.raises(ValueError):
+        key_between("b", "a")
+    with pytest.raises(ValueError):
+        key_between("a", "a")
+    with pytest.raises(ValueError):
+        key_between("a0", None)
+
+
+def test_spread_keys_are_ordered_and_leave_room() -> None:
+    for count in (1, 61, 62, 1000):
+        keys = list(spread_keys(count))
+        assert len(keys) == count
+        assert keys == sorted(set(keys))
+        assert all(key and not key.endswith(DIGITS[0]) for key in keys)
+        for a, b in zip(keys, keys[1:]):
+            key_between(a, b)
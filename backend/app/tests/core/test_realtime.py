@@ -0,0 +1,56 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.core import realtime
+from app.core.realtime import QUEUE_SIZE, RESYNC_EVENT, RealtimeHub, task_event
+
+
+def test_hub_dispatches_to_the_owner_only() -> None:
+    hub = RealtimeHub()
+    owner_id, other_id = uuid.uuid4(), uuid.uuid4()
+    event = task_event("task.created", owner_id, [uuid.uuid4()])
+
+    with hub.subscribe(owner_id) as owner_queue, hub.subscribe(other_id) as other_queue:
+        hub.dispatch(event)
+        assert owner_queue.get_nowait() == event
+        assert other_queue.empty()
+
+
+def test_hub_replaces_overflow_with_resync() -> None:
+    hub = RealtimeHub()
+    owner_id = uuid.uuid4()
+
+    with hub.subscribe(owner_id) as queue:
+        for _ in range(QUEUE_SIZE + 1):
+            hub.dispatch(task_event("task.updated", owner_id, [uuid.uuid4()]))
+        assert queue.qsize() == 1
+        assert queue.get_nowait() == RESYNC_EVENT
+
+
+def test_hub_forgets_closed_subscriptions() -> None:
+    hub = RealtimeHub()
+    owner_id = uuid.uuid4()
+
+    with hub.subscribe(owner_id):
+        pass
+    hub.dispatch(task_event("task.deleted", owner_id, []))
+    assert owner_id not in hub._subscribers
+
+
+def test_listen_reconnects_after_any_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts = []
+
+    async def connect(*args: object, **kwargs: object) -> None:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("unexpected")
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(realtime.psycopg.AsyncConnection, "connect", connect)
+    monkeypatch.setattr(realtime, "RECONNECT_DELAY_SECONDS", 0)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(RealtimeHub().listen())
+    assert len(attempts) == 2
@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.scheduler import ReminderScheduler
+
+LEAD = timedelta(minutes=settings.TASK_REMINDER_LEAD_MINUTES)
+
+
+def test_reminders_pop_in_deadline_order() -> None:
+    scheduler = ReminderScheduler()
+    now = datetime.now(timezone.utc)
+    later, sooner = uuid.uuid4(), uuid.uuid4()
+    scheduler._schedule(later, now + LEAD + timedelta(minutes=2))
+    scheduler._schedule(sooner, now + LEAD + timedelta(minutes=1))
+
+    assert scheduler._pop_due(now) == []
+    due = scheduler._pop_due(now + timedelta(minutes=5))
+    assert [task_id for task_id, _ in due] == [sooner, later]
+
+
+def test_rescheduled_and_cancelled_reminders_are_skipped() -> None:
+    scheduler = ReminderScheduler()
+    now = datetime.now(timezone.utc)
+    moved, cancelled = uuid.uuid4(), uuid.uuid4()
+    scheduler._schedule(moved, now + LEAD + timedelta(minutes=1))
+    scheduler._schedule(cancelled, now + LEAD + timedelta(minutes=1))
+    new_due = now + LEAD + timedelta(minutes=10)
+    scheduler._schedule(moved, new_due)
+    scheduler._schedule(cancelled, None)
+
+    assert scheduler._pop_due(now + timedelta(minutes=5)) == []
+    assert scheduler._pop_due(now + timedelta(minutes=15)) == [(moved, new_due)]
+
+
+def test_reminders_beyond_the_horizon_wait_for_the_next_load() -> None:
+    scheduler = ReminderScheduler()
+    far = datetime.now(timezone.utc) + LEAD + timedelta(minutes=settings.TASK_REMINDER_HORIZON_MINUTES + 1)
+    scheduler._schedule(uuid.uuid4(), far)
+    assert scheduler._heap == []
@@ -0,0 +1,98 @@
+import uuid
+
+from sqlmodel import Session, func, select
+
+from app import crud
+from app.models import Categories, ETaskPriority, ETaskStatus, Notes, Task, UserCounters
+from app.tests.utils.task import create_random_task
+from app.tests.utils.user import create_random_user
+
+STATUS_COUNTERS = {
+    ETaskStatus.PENDING: "task_pending",
+    ETaskStatus.IN_PROGRESS: "task_in_progress",
+    ETaskStatus.COMPLETED: "task_completed",
+    ETaskStatus.CANCELLED: "task_cancelled",
+}
+PRIORITY_COUNTERS = {
+    ETaskPriority.HIGH: "task_high",
+    ETaskPriority.MEDIUM: "task_medium",
+    ETaskPriority.LOW: "task_low",
+}
+
+
+def _assert_counters_match(db: Session, owner_id: uuid.UUID) -> None:
+    """
+    The trigger-maintained counters of the owner equal a COUNT(*) of the rows
+    """
+    db.expire_all()
+    counters = db.get(UserCounters, owner_id)
+    assert counters is not None
+    tasks = db.exec(select(Task.status, Task.priority).where(Task.owner_id == owner_id)).all()
+    expected = {"task_total": len(tasks)}
+    for status, column in STATUS_COUNTERS.items():
+        expected[column] = sum(task.status == status for task in tasks)
+    for priority, column in PRIORITY_COUNTERS.items():
+        expected[column] = sum(task.priority == priority for task in tasks)
+    expected["note_total"] = db.exec(
+        select(func.count()).select_from(Notes).where(Notes.owner_id == owner_id)
+    ).one()
+    expected["category_total"] = db.exec(
+        select(func.count()).select_from(Categories).where(Categories.owner_id == owner_id)
+    ).one()
+    assert {column: getattr(counters, column) for column in expected} == expected
+
+
+def test_counters_follow_inserts_updates_and_deletes(db: Session) -> None:
+    user = create_random_user(db)
+    category = Categories(title="work", owner_id=user.id)
+    other_category = Categories(title="home", owner_id=user.id)
+    db.add_all([category, other_category])
+    db.commit()
+    tasks = [
+        create_random_task(db, user, priority=ETaskPriority.HIGH, categories_id=category.id),
+        create_random_task(db, user, priority=ETaskPriority.LOW, categories_id=category.id),
+        create_random_task(db, user),
+    ]
+    db.add_all([Notes(title="note", task_id=task.id, owner_id=user.id) for task in tasks])
+    db.commit()
+    _assert_counters_match(db, user.id)
+
+    # One statement updating several rows
+    crud.update_tasks_status(
+        session=db, task_ids=[task.id for task in tasks[:2]], status=ETaskStatus.COMPLETED, owner_id=user.id
+    )
+    db.commit()
+    _assert_counters_match(db, user.id)
+
+    # Moving a task to another category changes no total
+    crud.update_task(
+        session=db,
+        task_id=tasks[0].id,
+        owner_id=user.id,
+        values={"categories_id": other_category.id, "priority": ETaskPriority.MEDIUM},
+    )
+    db.commit()
+    _assert_counters_match(db, user.id)
+
+    crud.delete_owned(session=db, model=Task, owner_id=user.id, ids=[tasks[2].id])
+    db.commit()
+    _assert_counters_match(db, user.id)
+
+    # The category's tasks and their notes go through ON DELETE CASCADE
+    crud.delete_owned(session=db, model=Categories, owner_id=user.id, ids=[category.id])
+    db.commit()
+    _assert_counters_match(db, user.id)
+
+
+def test_counters_are_per_owner(db: Session) -> None:
+    user, other = create_random_user(db), create_random_user(db)
+    mine = create_random_task(db, user)
+    create_random_task(db, other)
+
+    crud.update_tasks_status(
+        session=db, task_ids=[mine.id], status=ETaskStatus.IN_PROGRESS, owner_id=None
+    )
+    crud.delete_owned(session=db, model=Task, owner_id=None, ids=[mine.id])
+    db.commit()
+    _assert_counters_match(db, user.id)
+    _assert_counters_match(db, other.id)
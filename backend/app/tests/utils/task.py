@@ -0,0 +1,19 @@
+from typing import Any
+
+from sqlmodel import Session
+
+from app.models import Task, User
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_task(db: Session, owner: User, **values: Any) -> Task:
+    task = Task(**{
+        "title": random_lower_string(),
+        "description": random_lower_string(),
+        "owner_id": owner.id,
+        **values,
+    })
+    db.add(task)
+    db.commit()
+    db.refresh(task)
+    return task